@@ -13,25 +13,36 @@ block_cipher = None
 # Get project root
 project_root = Path(SPECPATH)
 
-# Resource files
-resource_files = [
+# Resource directories as (source dir, file suffix, destination)
+resource_dirs = [
     # Language files
-    ('src/resources/langs/*.json', 'resources/langs'),
+    ('src/resources/langs', '.json', 'resources/langs'),
     # Icons
-    ('src/resources/icons/*', 'resources/icons'),
+    ('src/resources/icons', '', 'resources/icons'),
     # Themes
-    ('src/resources/themes/*', 'resources/themes'),
+    ('src/resources/themes', '', 'resources/themes'),
+]
+
+# Individual resource files
+resource_files = [
     # Documentation
     ('LICENSE', '.'),
     ('README.md', '.'),
 ]
 
-# Collect data files
+# Collect data files (dirent types avoid a stat per entry)
 datas = []
-for src_pattern, dst_dir in resource_files:
-    src_path = project_root / src_pattern
-    for file_path in Path(src_path.parent).glob(src_path.name):
-        datas.append((str(file_path), dst_dir))
+for src_dir, suffix, dst_dir in resource_dirs:
+    try:
+        with os.scandir(project_root / src_dir) as it:
+            datas.extend((entry.path, dst_dir) for entry in it
+                         if entry.is_file(follow_symlinks=False) and entry.name.endswith(suffix))
+    except FileNotFoundError:
+        pass
+for src_file, dst_dir in resource_files:
+    src_path = project_root / src_file
+    if src_path.is_file():
+        datas.append((str(src_path), dst_dir))
 
 # Hidden imports
 hidden_imports = [
@@ -73,9 +84,13 @@ import PyQt6
 qt_path = os.path.dirname(PyQt6.__file__)
 for plugin in qt_plugins:
     plugin_path = os.path.join(qt_path, 'Qt6', 'plugins', plugin)
-    if os.path.exists(plugin_path):
-        binaries.extend([(os.path.join(plugin_path, file), os.path.join('PyQt6', 'Qt6', 'plugins', plugin))
-                        for file in os.listdir(plugin_path) if file.endswith('.dll')])
+    try:
+        with os.scandir(plugin_path) as it:
+            binaries.extend([(entry.path, os.path.join('PyQt6', 'Qt6', 'plugins', plugin))
+                            for entry in it
+                            if entry.is_file(follow_symlinks=False) and entry.name.endswith('.dll')])
+    except FileNotFoundError:
+        pass
 
 a = Analysis(
     ['src/main.py'],
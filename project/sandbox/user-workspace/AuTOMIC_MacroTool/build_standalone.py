@@ -4,35 +4,29 @@ Copyright (c) 2025 AtomicArk
 """
 
 import os
+import re
 import sys
+import argparse
+import functools
 import shutil
+import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import PyInstaller.__main__
 
-def clean_build():
-    """Clean build directories."""
-    print("Cleaning build directories...")
-    
-    # Remove build directories
-    dirs_to_clean = ['build', 'dist']
-    for dir_name in dirs_to_clean:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-    
-    # Remove spec file
-    if os.path.exists('atomic_macro.spec'):
-        os.remove('atomic_macro.spec')
+APP_NAME = "AuTOMIC MacroTool"
 
-def create_version_info():
-    """Create version info file."""
-    print("Creating version info...")
-    
-    version_info = '''
+VERSION_PATTERN = re.compile(r'^__version__\s*=\s*["\']([^"\']+)', re.M)
+
+# Generated version resource, kept in build/ between runs
+VERSION_FILE = os.path.join('build', 'version_info.txt')
+
+# Windows version resource (filled in with str.format)
+_VERSION_INFO_TEMPLATE = '''
 VSVersionInfo(
   ffi=FixedFileInfo(
-    filevers=(1, 0, 0, 0),
-    prodvers=(1, 0, 0, 0),
+    filevers={version_tuple},
+    prodvers={version_tuple},
     mask=0x3f,
     flags=0x0,
     OS=0x40004,
@@ -46,102 +40,28 @@ VSVersionInfo(
         u'040904B0',
         [StringStruct(u'CompanyName', u'AtomicArk'),
          StringStruct(u'FileDescription', u'AuTOMIC MacroTool'),
-         StringStruct(u'FileVersion', u'1.0.0'),
+         StringStruct(u'FileVersion', u'{version}'),
          StringStruct(u'InternalName', u'atomic_macro'),
          StringStruct(u'LegalCopyright', u'© 2025 AtomicArk. All rights reserved.'),
          StringStruct(u'OriginalFilename', u'AuTOMIC_MacroTool.exe'),
          StringStruct(u'ProductName', u'AuTOMIC MacroTool'),
-         StringStruct(u'ProductVersion', u'1.0.0')])
+         StringStruct(u'ProductVersion', u'{version}')])
     ]),
     VarFileInfo([VarStruct(u'Translation', [1033, 1200])])
   ]
 )
 '''
-    
-    with open('version_info.txt', 'w') as f:
-        f.write(version_info)
 
-def build_executable():
-    """Build standalone executable."""
-    print("Building executable...")
-    
-    # Create version info
-    create_version_info()
-    
-    # Prepare resource files
-    resources = [
-        ('src/resources/langs/*.json', 'resources/langs'),
-        ('src/resources/icons/*', 'resources/icons'),
-        ('src/resources/themes/*', 'resources/themes'),
-        ('LICENSE', '.'),
-        ('README.md', '.')
-    ]
-    
-    # Prepare hidden imports
-    hidden_imports = [
-        'win32api',
-        'win32con',
-        'win32gui',
-        'win32process',
-        'keyboard',
-        'mouse',
-        'pynput',
-        'interception',
-        'psutil',
-        'darkdetect',
-        'packaging',
-        'requests'
-    ]
-    
-    # Build arguments
-    args = [
-        'src/main.py',
-        '--name=AuTOMIC_MacroTool',
-        '--onefile',
-        '--windowed',
-        '--icon=src/resources/icons/app.ico',
-        '--version-file=version_info.txt',
-        '--uac-admin',  # Request admin privileges
-        '--clean',
-        '--noconfirm',
-        f'--distpath={os.path.join("dist", "standalone")}',
-        '--add-data=version_info.txt;.'
-    ]
-    
-    # Add resources
-    for src, dst in resources:
-        for file in Path().glob(src):
-            args.append(f'--add-data={file};{dst}')
-    
-    # Add hidden imports
-    for imp in hidden_imports:
-        args.append(f'--hidden-import={imp}')
-    
-    # Run PyInstaller
-    PyInstaller.__main__.run(args)
-    
-    # Clean up version info
-    os.remove('version_info.txt')
-
-def create_installer():
-    """Create installer using Inno Setup."""
-    print("Creating installer...")
-    
-    # Check if Inno Setup is installed
-    inno_compiler = r"C:\Program Files (x86)\Inno Setup 6\ISCC.exe"
-    if not os.path.exists(inno_compiler):
-        print("Inno Setup not found. Please install it first.")
-        return False
-    
-    # Create installer script
-    installer_script = '''
-#define MyAppName "AuTOMIC MacroTool"
-#define MyAppVersion "1.0.0"
+# Inno Setup script (filled in with %-formatting; the script uses braces)
+_INNO_TEMPLATE = '''
+#define MyAppName "%(app_name)s"
+#define MyAppVersion "%(app_version)s"
 #define MyAppPublisher "AtomicArk"
 #define MyAppURL "https://github.com/Atomic-Ark/AuTOMIC_MacroTool"
 #define MyAppExeName "AuTOMIC_MacroTool.exe"
 
 [Setup]
+SourceDir=..
 AppId={{F8A2E6D8-1234-4567-8901-ABCDEF123456}}
 AppName={#MyAppName}
 AppVersion={#MyAppVersion}
@@ -174,7 +94,7 @@ Name: "desktopicon"; Description: "{cm:CreateDesktopIcon}"; GroupDescription: "{
 Name: "quicklaunchicon"; Description: "{cm:CreateQuickLaunchIcon}"; GroupDescription: "{cm:AdditionalIcons}"; Flags: unchecked; OnlyBelowVersion: 6.1; Check: not IsAdminInstallMode
 
 [Files]
-Source: "dist\\standalone\\{#MyAppExeName}"; DestDir: "{app}"; Flags: ignoreversion
+%(app_files)s
 Source: "LICENSE"; DestDir: "{app}"; Flags: ignoreversion
 Source: "README.md"; DestDir: "{app}"; Flags: ignoreversion
 Source: "src\\resources\\*"; DestDir: "{app}\\resources"; Flags: ignoreversion recursesubdirs createallsubdirs
@@ -191,37 +111,336 @@ Filename: "{app}\\{#MyAppExeName}"; Description: "{cm:LaunchProgram,{#StringChan
 [UninstallDelete]
 Type: filesandordirs; Name: "{userappdata}\\{#MyAppName}"
 '''
+
+# [Files] entry for the application, per PyInstaller output layout
+_INNO_ONEFILE_FILES = 'Source: "dist\\standalone\\{#MyAppExeName}"; DestDir: "{app}"; Flags: ignoreversion'
+_INNO_ONEDIR_FILES = ('Source: "dist\\standalone\\AuTOMIC_MacroTool\\*"; DestDir: "{app}"; '
+                      'Flags: ignoreversion recursesubdirs createallsubdirs')
+
+@functools.lru_cache(maxsize=1)
+def get_version():
+    """Read package version from src/__init__.py."""
+    text = Path('src/__init__.py').read_text(encoding='utf-8')
+    match = VERSION_PATTERN.search(text)
+    if not match:
+        raise RuntimeError("Unable to find __version__ in src/__init__.py")
+    return match.group(1)
+
+def clean_build(full: bool = False):
+    """Clean build directories.
+
+    The PyInstaller work directory (``build/``) and the installer output
+    are only removed on a full clean so incremental builds can reuse them.
+    """
+    print("Cleaning build directories...")
     
-    with open('installer.iss', 'w') as f:
-        f.write(installer_script)
+    dirs_to_clean = ['build', 'dist'] if full else [os.path.join('dist', 'standalone')]
+    files_to_clean = ['atomic_macro.spec']
+    
+    def remove(path):
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+    
+    # Directory trees are independent, so remove them concurrently
+    targets = dirs_to_clean + files_to_clean
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        list(executor.map(remove, targets))
+
+def create_version_info():
+    """Create version info file (kept between builds)."""
+    print("Creating version info...")
+    
+    version = get_version()
+    version_tuple = tuple(int(part) for part in re.findall(r'\d+', version)[:4])
+    version_tuple += (0,) * (4 - len(version_tuple))
+    
+    version_info = _VERSION_INFO_TEMPLATE.format(version=version, version_tuple=version_tuple)
+    
+    # Rewrite only on change so the file's mtime stays stable
+    data = version_info.encode('utf-8')
+    path = Path(VERSION_FILE)
+    if not path.exists() or path.read_bytes() != data:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+# Resource directories as (source dir, file suffixes, destination)
+RESOURCE_DIRS = [
+    ('src/resources/langs', ('.json',), 'resources/langs'),
+    ('src/resources/icons', ('.ico', '.png', '.svg'), 'resources/icons'),
+    ('src/resources/themes', ('.qss',), 'resources/themes'),
+]
+
+# Individual files bundled next to the executable
+RESOURCE_FILES = [
+    ('LICENSE', '.'),
+    ('README.md', '.'),
+]
+
+def get_data_files():
+    """Collect resources as (source, destination) pairs.
+
+    A directory whose entries are all files matching its suffixes is passed
+    as a single directory entry; otherwise the matching files are listed
+    one by one, so subdirectories and stray files are never bundled.
+    Each directory is scanned once and entries are classified from the
+    cached dirent type, so no extra stat calls are made per file.
+    """
+    data_files = []
+    for src_dir, suffixes, dst in RESOURCE_DIRS:
+        try:
+            with os.scandir(src_dir) as it:
+                entries = [(entry.path, entry.is_file(follow_symlinks=False) and entry.name.endswith(suffixes))
+                           for entry in it]
+        except FileNotFoundError:
+            continue
+        
+        if not entries:
+            continue
+        if all(matched for _, matched in entries):
+            data_files.append((src_dir, dst))
+        else:
+            data_files.extend((path, dst) for path, matched in entries if matched)
+    
+    data_files.extend(RESOURCE_FILES)
+    return data_files
+
+def check_sources():
+    """Compile ``src/`` in memory so syntax errors fail before PyInstaller runs."""
+    print("Checking sources...")
+    
+    count = 0
+    for src in Path('src').rglob('*.py'):
+        compile(src.read_bytes(), str(src), 'exec', dont_inherit=True)
+        count += 1
+    print(f"Checked {count} source files")
+
+def vendor_cache_key():
+    """Identify the installed dependency set (Python version + distributions)."""
+    from importlib.metadata import distributions
+    
+    installed = sorted(
+        f"{dist.metadata['Name']}=={dist.version}".lower()
+        for dist in distributions()
+    )
+    
+    h = hashlib.sha256()
+    h.update(sys.version.encode('utf-8'))
+    h.update('\n'.join(installed).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+def check_vendor_cache(key: str):
+    """Check whether cached dependency analysis is still valid.
+
+    Returns False when no successful build has recorded this dependency set.
+    """
+    return (Path('build') / f"vendor-{key}").is_dir()
+
+def record_vendor_cache(key: str):
+    """Record a successful build for the given dependency set."""
+    for stale in Path('build').glob('vendor-*'):
+        shutil.rmtree(stale, ignore_errors=True)
+    (Path('build') / f"vendor-{key}").mkdir(parents=True, exist_ok=True)
+
+def build_executable(clean: bool = False, release: bool = True):
+    """Build standalone executable.
+
+    Release builds produce a single-file executable; development builds
+    use a one-folder layout that skips archive assembly.
+    """
+    print("Building executable...")
+    
+    # Create version info
+    create_version_info()
+    
+    # Check sources compile before the slow PyInstaller run
+    check_sources()
+    
+    # Prepare hidden imports
+    hidden_imports = [
+        'win32api',
+        'win32con',
+        'win32gui',
+        'win32process',
+        'keyboard',
+        'mouse',
+        'pynput',
+        'interception',
+        'psutil',
+        'darkdetect',
+        'packaging',
+        'requests'
+    ]
+    
+    # Build arguments
+    args = [
+        'src/main.py',
+        '--name=AuTOMIC_MacroTool',
+        '--onefile' if release else '--onedir',
+        '--windowed',
+        '--icon=src/resources/icons/app.ico',
+        f'--version-file={VERSION_FILE}',
+        '--uac-admin',  # Request admin privileges
+        '--noconfirm',
+        '--workpath=build',
+        f'--distpath={os.path.join("dist", "standalone")}',
+        f'--add-data={VERSION_FILE};.'
+    ]
+    
+    # Add resources
+    for src, dst in get_data_files():
+        args.append(f'--add-data={src};{dst}')
+    
+    # Add hidden imports
+    for imp in hidden_imports:
+        args.append(f'--hidden-import={imp}')
+    
+    # Only wipe PyInstaller's cache when requested or dependencies changed
+    vendor_key = vendor_cache_key()
+    if not check_vendor_cache(vendor_key) and not clean:
+        print("Dependencies changed, rebuilding dependency cache...")
+        clean = True
+    if clean:
+        args.append('--clean')
+    
+    # Run PyInstaller (imported here to keep other commands fast)
+    import PyInstaller.__main__ as pyinstaller
+    pyinstaller.run(args)
+    
+    # Only a completed build makes the dependency cache trustworthy
+    record_vendor_cache(vendor_key)
+
+# Resolved Inno Setup compiler path (None until first lookup)
+_inno_compiler = None
+
+def find_inno_compiler():
+    """Locate the Inno Setup compiler, caching the result."""
+    global _inno_compiler
+    if _inno_compiler is not None:
+        return _inno_compiler
+    
+    candidates = [shutil.which('ISCC')]
+    inno_env = os.environ.get('INNO_SETUP')
+    if inno_env:
+        candidates.append(inno_env)
+        candidates.append(os.path.join(inno_env, 'ISCC.exe'))
+    candidates.append(r"C:\Program Files (x86)\Inno Setup 6\ISCC.exe")
+    
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            _inno_compiler = candidate
+            break
+    
+    return _inno_compiler
+
+def hash_tree(h, top):
+    """Feed every file below a directory into a hash."""
+    for root, dirs, files in os.walk(top):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            h.update(path.encode('utf-8'))
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+
+def hash_installer_inputs(installer_script, onefile=True):
+    """Hash everything the installer is built from."""
+    h = hashlib.sha256()
+    
+    if onefile:
+        with open(os.path.join('dist', 'standalone', 'AuTOMIC_MacroTool.exe'), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    else:
+        hash_tree(h, os.path.join('dist', 'standalone', 'AuTOMIC_MacroTool'))
+    
+    h.update(installer_script.encode('utf-8'))
+    hash_tree(h, os.path.join('src', 'resources'))
+    
+    return h.hexdigest()
+
+def create_installer(onefile: bool = True):
+    """Create installer using Inno Setup.
+
+    Packages either the single-file executable or the whole one-folder
+    build, matching how the executable was produced.
+    """
+    print("Creating installer...")
+    
+    # Check if Inno Setup is installed
+    inno_compiler = find_inno_compiler()
+    if not inno_compiler:
+        print("Inno Setup not found. Please install it first.")
+        return False
+    
+    # Create installer script
+    installer_script = _INNO_TEMPLATE % {
+        'app_name': APP_NAME,
+        'app_version': get_version(),
+        'app_files': _INNO_ONEFILE_FILES if onefile else _INNO_ONEDIR_FILES,
+    }
+    
+    # Skip recompilation when nothing changed since the last installer
+    installer_dir = Path('dist') / 'installer'
+    hash_file = installer_dir / '.inputs.sha256'
+    inputs_hash = hash_installer_inputs(installer_script, onefile)
+    if (hash_file.exists() and hash_file.read_text() == inputs_hash
+            and (installer_dir / 'AuTOMIC_MacroTool_Setup.exe').exists()):
+        print("Installer is up to date.")
+        return True
     
     # Create installer directory
-    os.makedirs('dist/installer', exist_ok=True)
+    installer_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Keep the script with other build artifacts; rewrite only on change
+    script_file = Path('build') / 'installer.iss'
+    script_hash_file = installer_dir / '.installer.iss.sha256'
+    script_hash = hashlib.sha256(installer_script.encode('utf-8')).hexdigest()
+    if (not script_file.exists() or not script_hash_file.exists()
+            or script_hash_file.read_text() != script_hash):
+        script_file.parent.mkdir(parents=True, exist_ok=True)
+        script_file.write_text(installer_script)
+        script_hash_file.write_text(script_hash)
     
     # Run Inno Setup Compiler
-    subprocess.run([inno_compiler, '/Q', 'installer.iss'])
+    result = subprocess.run([inno_compiler, '/Q', str(script_file)])
     
-    # Clean up installer script
-    os.remove('installer.iss')
+    if result.returncode != 0:
+        return False
     
+    hash_file.write_text(inputs_hash)
     return True
 
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build AuTOMIC MacroTool")
+    parser.add_argument('--clean', action='store_true',
+                       help='Discard cached build data and rebuild from scratch')
+    parser.add_argument('--dev', '--fast', dest='dev', action='store_true',
+                       help='Fast development build (one-folder, no single-file archive)')
+    return parser.parse_args()
+
 def main():
     """Main build process."""
+    args = parse_arguments()
+    
     try:
         # Clean previous builds
-        clean_build()
+        clean_build(full=args.clean)
         
         # Build executable
-        build_executable()
+        build_executable(clean=args.clean, release=not args.dev)
         
         # Create installer
-        if create_installer():
+        if create_installer(onefile=not args.dev):
             print("Build completed successfully!")
             print("Installer created at: dist/installer/AuTOMIC_MacroTool_Setup.exe")
         else:
             print("Build completed, but installer creation failed.")
-            print("Standalone executable available at: dist/standalone/AuTOMIC_MacroTool.exe")
+            exe_dir = 'dist/standalone' if not args.dev else 'dist/standalone/AuTOMIC_MacroTool'
+            print(f"Standalone executable available at: {exe_dir}/AuTOMIC_MacroTool.exe")
         
     except Exception as e:
         print(f"Build failed: {e}")
@@ -4,11 +4,25 @@ Copyright (c) 2025 AtomicArk
 """
 
 import os
+import re
+import functools
+from pathlib import Path
 from setuptools import setup, find_packages
 
+VERSION_PATTERN = re.compile(r'^__version__\s*=\s*["\']([^"\']+)', re.M)
+
+@functools.lru_cache(maxsize=1)
+def get_version():
+    """Read package version from src/__init__.py."""
+    text = Path('src/__init__.py').read_text(encoding='utf-8')
+    match = VERSION_PATTERN.search(text)
+    if not match:
+        raise RuntimeError("Unable to find __version__ in src/__init__.py")
+    return match.group(1)
+
 # Read requirements
 with open('requirements.txt') as f:
-    requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    requirements = [s for s in map(str.strip, f.read().splitlines()) if s and s[0] != '#']
 
 # Read README
 with open('README.md', encoding='utf-8') as f:
@@ -16,7 +30,7 @@ with open('README.md', encoding='utf-8') as f:
 
 # Package info
 PACKAGE_NAME = "atomic_macro"
-VERSION = "1.0.0"
+VERSION = get_version()
 AUTHOR = "AtomicArk"
 AUTHOR_EMAIL = "atomicarkft@gmail.com"
 DESCRIPTION = "Advanced Macro Recording and Automation Tool"
@@ -113,6 +127,10 @@ setup(
             "sphinx-rtd-theme>=1.2.0",
             "sphinx-autodoc-typehints>=1.23.0",
         ],
+        "speedups": [
+            "orjson>=3.9.0",
+            "msgspec>=0.18.0",
+        ],
         "stealth": [
             "interception-python>=1.0.3",
             "opencv-python>=4.7.0",
@@ -3,6 +3,9 @@ AuTOMIC MacroTool - Advanced Macro Recording and Automation Tool
 Copyright (c) 2025 AtomicArk
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 __title__ = "AuTOMIC MacroTool"
 __version__ = "1.0.0"
 __author__ = "AtomicArk"
@@ -54,12 +57,12 @@ SUPPORTED_LANGUAGES = {
 }
 
 # Supported themes
-SUPPORTED_THEMES = [
+SUPPORTED_THEMES = (
     'light',
     'dark',
     'system',
     'custom',
-]
+)
 
 # File extensions
 FILE_EXTENSIONS = {
@@ -105,6 +108,12 @@ SYSTEM_REQUIREMENTS = {
     'storage': "100MB",
 }
 
+# Read-only views returned by the getters below
+_SUPPORTED_LANGUAGES_VIEW = MappingProxyType(SUPPORTED_LANGUAGES)
+_UPDATE_INFO_VIEW = MappingProxyType(UPDATE_INFO)
+_CONTACT_INFO_VIEW = MappingProxyType(CONTACT_INFO)
+_SYSTEM_REQUIREMENTS_VIEW = MappingProxyType(SYSTEM_REQUIREMENTS)
+
 def get_version():
     """Get package version."""
     return __version__
@@ -122,34 +131,37 @@ def get_app_info():
         'release_date': __release_date__,
     }
 
+@lru_cache(maxsize=None)
 def is_feature_enabled(feature: str) -> bool:
     """Check if a feature is enabled."""
     return FEATURES.get(feature, False)
 
 def get_supported_languages():
-    """Get supported languages."""
-    return SUPPORTED_LANGUAGES.copy()
+    """Get supported languages (read-only mapping)."""
+    return _SUPPORTED_LANGUAGES_VIEW
 
 def get_supported_themes():
     """Get supported themes."""
-    return SUPPORTED_THEMES.copy()
+    return SUPPORTED_THEMES
 
+@lru_cache(maxsize=None)
 def get_file_extension(file_type: str) -> str:
     """Get file extension for given type."""
     return FILE_EXTENSIONS.get(file_type, '')
 
+@lru_cache(maxsize=None)
 def get_docs_url(section: str = 'main') -> str:
     """Get documentation URL."""
     return DOCS.get(section, DOCS['main'])
 
 def get_update_info():
-    """Get update information."""
-    return UPDATE_INFO.copy()
+    """Get update information (read-only mapping)."""
+    return _UPDATE_INFO_VIEW
 
 def get_contact_info():
-    """Get contact information."""
-    return CONTACT_INFO.copy()
+    """Get contact information (read-only mapping)."""
+    return _CONTACT_INFO_VIEW
 
 def get_system_requirements():
-    """Get system requirements."""
-    return SYSTEM_REQUIREMENTS.copy()
+    """Get system requirements (read-only mapping)."""
+    return _SYSTEM_REQUIREMENTS_VIEW
@@ -5,16 +5,48 @@ Copyright (c) 2025 AtomicArk
 
 import logging
 import json
+import os
 import threading
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from typing import Dict, Optional, Any, Tuple
 from pathlib import Path
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, fields, is_dataclass
 import locale
 import darkdetect
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from ..utils.compat import DATACLASS_SLOTS
 from ..utils.debug_helper import get_debug_helper, DebugLevel
 
-@dataclass
+# Config 'debug_level' string -> DebugLevel
+_DEBUG_LEVELS = {level.name.lower(): level for level in DebugLevel}
+
+def _make_dirs(*paths) -> None:
+    """Create directories, skipping the syscall for ones that exist."""
+    for path in paths:
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+
+@lru_cache(maxsize=1)
+def _system_lang() -> Optional[str]:
+    """Get system language (queried once per process)."""
+    return locale.getdefaultlocale()[0]
+
+@lru_cache(maxsize=1)
+def _system_theme() -> Optional[str]:
+    """Get system theme (queried once per process)."""
+    return darkdetect.theme()
+
+@dataclass(**DATACLASS_SLOTS)
 class HotkeyConfig:
     """Hotkey configuration."""
     record_start: str = 'F1'
@@ -27,7 +59,7 @@ class HotkeyConfig:
     panic_button: str = 'Ctrl+Alt+P'
     show_hide: str = 'Ctrl+Alt+H'
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RecordingConfig:
     """Recording configuration."""
     record_mouse: bool = True
@@ -37,7 +69,7 @@ class RecordingConfig:
     window_mode: bool = True
     directx_mode: bool = False
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PlaybackConfig:
     """Playback configuration."""
     repeat_mode: str = 'once'  # 'once', 'loop', 'count'
@@ -49,7 +81,7 @@ class PlaybackConfig:
     restore_mouse: bool = True
     stealth_mode: bool = False
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AppConfig:
     """Application configuration."""
     # General
@@ -83,36 +115,40 @@ class AppConfig:
 class ConfigManager:
     """Manages application configuration."""
     
-    _instance = None
-    _lock = threading.Lock()
+    # Delay before writing coalesced changes (seconds)
+    SAVE_DELAY = 0.5
     
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-            return cls._instance
-
     def __init__(self):
-        if not hasattr(self, '_initialized'):
-            self.logger = logging.getLogger('ConfigManager')
-            self.debug = get_debug_helper()
-            
-            # State
-            self.config = AppConfig()
-            self._config_file: Optional[Path] = None
-            self._backup_file: Optional[Path] = None
-            self._initialized = False
-            
-            # Initialize
-            self._init_config()
-            self._initialized = True
+        self.logger = logging.getLogger('ConfigManager')
+        self.debug = get_debug_helper()
+        
+        # State
+        self.config = AppConfig()
+        self._config_file: Optional[Path] = None
+        self._backup_file: Optional[Path] = None
+        
+        # Serialized mirror of self.config
+        self._config_dict: Dict[str, Any] = {}
+        self._last_saved_digest: int = 0
+        
+        # Dotted key -> (owner object, attribute name)
+        self._resolver: Dict[str, Tuple[Any, str]] = {}
+        
+        # Deferred saving
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        
+        # Initialize
+        self._build_resolver()
+        self._init_config()
 
     def _init_config(self):
         """Initialize configuration."""
         try:
             # Get config directory
             config_dir = Path.home() / "Documents" / "AuTOMIC_MacroTool" / "config"
-            config_dir.mkdir(parents=True, exist_ok=True)
+            _make_dirs(config_dir)
             
             self._config_file = config_dir / "config.json"
             self._backup_file = config_dir / "config.backup.json"
@@ -132,14 +168,15 @@ class ConfigManager:
         """Initialize default configuration."""
         try:
             # Get system language
-            system_lang = locale.getdefaultlocale()[0]
+            system_lang = _system_lang()
             if system_lang:
                 self.config.language = system_lang
             
-            # Get system theme
-            system_theme = darkdetect.theme()
-            if system_theme:
-                self.config.theme = system_theme.lower()
+            # Get system theme (only if not already chosen)
+            if not self.config.theme:
+                system_theme = _system_theme()
+                if system_theme:
+                    self.config.theme = system_theme.lower()
             
             # Set directories
             docs_dir = Path.home() / "Documents" / "AuTOMIC_MacroTool"
@@ -147,11 +184,47 @@ class ConfigManager:
             self.config.backup_directory = str(docs_dir / "backups")
             
             # Create directories
-            Path(self.config.macro_directory).mkdir(parents=True, exist_ok=True)
-            Path(self.config.backup_directory).mkdir(parents=True, exist_ok=True)
+            _make_dirs(self.config.macro_directory,
+                       self.config.backup_directory)
             
         except Exception as e:
             self.logger.error(f"Failed to initialize default config: {e}")
+        
+        self._config_dict = asdict(self.config)
+        self._build_resolver()
+
+    def _build_resolver(self):
+        """Map every dotted config key to its owner and attribute."""
+        resolver = {}
+        stack = [(self.config, '')]
+        while stack:
+            obj, prefix = stack.pop()
+            for f in fields(obj):
+                key = prefix + f.name
+                resolver[key] = (obj, f.name)
+                value = getattr(obj, f.name)
+                if is_dataclass(value):
+                    stack.append((value, key + '.'))
+        self._resolver = resolver
+
+    def _update_config(self, target: Any, source: Any) -> None:
+        """Update a config dataclass in place from a dict or dataclass."""
+        from_dict = isinstance(source, dict)
+        for f in fields(target):
+            if from_dict:
+                if f.name not in source:
+                    continue
+                value = source[f.name]
+            else:
+                value = getattr(source, f.name)
+            
+            # Keep nested sections (and references to them) alive
+            current = getattr(target, f.name)
+            if is_dataclass(current) and (isinstance(value, dict)
+                                          or is_dataclass(value)):
+                self._update_config(current, value)
+            else:
+                setattr(target, f.name, value)
 
     def load_config(self) -> bool:
         """Load configuration from file."""
@@ -160,38 +233,31 @@ class ConfigManager:
                 return False
             
             # Load config
-            with open(self._config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Convert to dataclass
-            config_dict = {}
-            
-            # General settings
-            for key in ['language', 'theme', 'ui_scale', 'autostart',
-                       'minimize_to_tray', 'check_updates', 'macro_directory',
-                       'backup_directory', 'debug_level', 'performance_mode',
-                       'save_window_state', 'backup_interval', 'max_backups']:
-                if key in data:
-                    config_dict[key] = data[key]
-            
-            # Hotkeys
-            if 'hotkeys' in data:
-                config_dict['hotkeys'] = HotkeyConfig(**data['hotkeys'])
-            
-            # Recording
-            if 'recording' in data:
-                config_dict['recording'] = RecordingConfig(**data['recording'])
-            
-            # Playback
-            if 'playback' in data:
-                config_dict['playback'] = PlaybackConfig(**data['playback'])
-            
-            # Update config
-            self.config = AppConfig(**config_dict)
+            raw = self._config_file.read_bytes()
+            source = None
+            
+            # Typed decode straight into the dataclasses
+            if msgspec is not None:
+                try:
+                    source = msgspec.json.decode(raw, type=AppConfig)
+                except msgspec.ValidationError as e:
+                    self.logger.warning(f"Config validation failed, "
+                                        f"loading known keys only: {e}")
+            
+            if source is None:
+                if orjson is not None:
+                    source = orjson.loads(raw)
+                else:
+                    source = json.loads(raw.decode('utf-8'))
+            self._last_saved_digest = hash(raw)
+            
+            # Update config in place (resolver entries stay valid)
+            self._update_config(self.config, source)
+            self._config_dict = asdict(self.config)
             
             # Apply debug level
-            debug_level = getattr(DebugLevel, self.config.debug_level.upper(),
-                                DebugLevel.BASIC)
+            debug_level = _DEBUG_LEVELS.get(self.config.debug_level.lower(),
+                                            DebugLevel.BASIC)
             self.debug.set_debug_level(debug_level)
             
             return True
@@ -201,36 +267,53 @@ class ConfigManager:
             return False
 
     def save_config(self) -> bool:
-        """Save configuration to file."""
+        """Save configuration to file.
+
+        Takes a fresh snapshot of ``self.config``, so changes made by
+        assigning to its attributes directly are included.
+        """
+        self._config_dict = asdict(self.config)
+        return self._write_config(self._config_dict)
+
+    def _write_config(self, config_dict: Dict[str, Any]) -> bool:
+        """Write a serialized configuration to file."""
         try:
             if not self._config_file:
                 return False
             
-            # Create backup
-            if self._config_file.exists() and self._backup_file:
-                self._config_file.rename(self._backup_file)
+            # Serialize config
+            if orjson is not None:
+                data = orjson.dumps(config_dict, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config_dict, indent=2).encode('utf-8')
             
-            # Convert to dict
-            config_dict = asdict(self.config)
+            # Nothing changed since the last load/save
+            digest = hash(data)
+            if digest == self._last_saved_digest and self._config_file.exists():
+                return True
             
-            # Save config
-            with open(self._config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_dict, f, indent=2)
+            # Write to a temporary file first
+            tmp_file = self._config_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(data)
+            
+            # Keep previous version as backup
+            if self._backup_file and self._config_file.exists():
+                os.replace(self._config_file, self._backup_file)
+            
+            # Atomically move new config into place
+            os.replace(tmp_file, self._config_file)
+            self._last_saved_digest = digest
             
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to save config: {e}")
-            
-            # Restore backup
-            if self._backup_file and self._backup_file.exists():
-                self._backup_file.rename(self._config_file)
-            
             return False
 
     def reset_config(self) -> bool:
         """Reset configuration to defaults."""
         try:
+            self.config = AppConfig()
             self._init_default_config()
             return self.save_config()
             
@@ -240,19 +323,10 @@ class ConfigManager:
 
     def get_value(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
-        try:
-            # Split nested keys
-            keys = key.split('.')
-            value = self.config
-            
-            # Navigate to value
-            for k in keys:
-                value = getattr(value, k)
-            
-            return value
-            
-        except Exception:
+        owner, attr = self._resolver.get(key, (None, None))
+        if owner is None:
             return default
+        return getattr(owner, attr)
 
     def set_value(self, key: str, value: Any) -> bool:
         """Set configuration value."""
@@ -268,21 +342,60 @@ class ConfigManager:
             # Set value
             setattr(target, keys[-1], value)
             
-            # Save config
-            return self.save_config()
+            # Mirror into the serialized snapshot
+            node = self._config_dict
+            for k in keys[:-1]:
+                node = node[k]
+            if is_dataclass(value):
+                node[keys[-1]] = asdict(value)
+                self._build_resolver()
+            else:
+                node[keys[-1]] = value
+            
+            # Save config (coalesced with other changes)
+            self._schedule_save()
+            return True
             
         except Exception as e:
             self.logger.error(f"Failed to set config value: {e}")
             return False
 
+    def _schedule_save(self):
+        """Schedule a deferred save, restarting the delay."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self._flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _flush(self, force: bool = False) -> bool:
+        """Write pending changes to disk."""
+        with self._save_lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if force:
+                self._dirty = False
+                return self.save_config()
+            if not self._dirty:
+                return True
+            self._dirty = False
+            return self._write_config(self._config_dict)
+
     def cleanup(self):
         """Clean up resources."""
         try:
             # Save config
-            self.save_config()
+            self._flush(force=True)
             
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
 
 # Global instance
 config_manager = ConfigManager()
+
+def get_config_manager() -> ConfigManager:
+    """Get global config manager instance."""
+    return config_manager
@@ -5,18 +5,23 @@ Copyright (c) 2025 AtomicArk
 
 import logging
 import threading
-from typing import Dict, List, Optional, Set, Any, Callable
-import time
+import queue
+from typing import Dict, List, Optional, Set, Any, Callable, Tuple
 import inspect
 import sys
 import traceback
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 import bdb
 import linecache
+from types import CodeType
 
+from ..utils.compat import DATACLASS_SLOTS
 from ..utils.debug_helper import get_debug_helper
 
+# Filename bdb.run() gives to code executed from a source string
+SCRIPT_FILENAME = '<string>'
+
 class DebuggerState(Enum):
     """Debugger states."""
     STOPPED = auto()
@@ -24,7 +29,7 @@ class DebuggerState(Enum):
     PAUSED = auto()
     STEPPING = auto()
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Breakpoint:
     """Breakpoint information."""
     id: int
@@ -33,8 +38,11 @@ class Breakpoint:
     condition: Optional[str] = None
     enabled: bool = True
     hit_count: int = 0
+    compiled_condition: Optional[CodeType] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Variable:
     """Variable information."""
     name: str
@@ -45,51 +53,61 @@ class Variable:
 class MacroDebugger(bdb.Bdb):
     """Debugs macro execution."""
     
-    _instance = None
-    _lock = threading.Lock()
-    
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-            return cls._instance
-
     def __init__(self):
-        if not hasattr(self, '_initialized'):
-            super().__init__()
-            self.logger = logging.getLogger('MacroDebugger')
-            self.debug = get_debug_helper()
-            
-            # State
-            self._state = DebuggerState.STOPPED
-            self._breakpoints: Dict[int, Breakpoint] = {}
-            self._next_breakpoint_id = 1
-            self._watch_variables: Set[str] = set()
-            self._current_frame = None
-            self._step_mode = False
-            
-            # Event handlers
-            self._on_line: Optional[Callable] = None
-            self._on_return: Optional[Callable] = None
-            self._on_exception: Optional[Callable] = None
-            self._on_variable_changed: Optional[Callable] = None
-            
-            self._initialized = True
+        super().__init__()
+        self.logger = logging.getLogger('MacroDebugger')
+        self.debug = get_debug_helper()
+        
+        # State
+        self._state = DebuggerState.STOPPED
+        self._breakpoints: Dict[int, Breakpoint] = {}
+        self._bp_index: Dict[Tuple[str, int], List[Breakpoint]] = {}
+        self._next_breakpoint_id = 1
+        self._watch_variables: Set[str] = set()
+        self._current_frame = None
+        self._step_mode = False
+        self._resume_event = threading.Event()
+        
+        # Source of the script being debugged
+        self._script_file = SCRIPT_FILENAME
+        self._script_lines: List[str] = []
+        
+        # Session worker (started on first use)
+        self._job_queue: queue.Queue = queue.Queue()
+        self._worker_thread: Optional[threading.Thread] = None
+        self._session_lock = threading.Lock()
+        self._session = 0  # Token of the latest session
+        self._active_session: Optional[int] = None  # Not yet unwound
+        
+        # Event handlers
+        self._on_line: Optional[Callable] = None
+        self._on_return: Optional[Callable] = None
+        self._on_exception: Optional[Callable] = None
+        self._on_variable_changed: Optional[Callable] = None
 
     def start(self, script: str) -> bool:
         """Start debugging script."""
         try:
-            if self._state != DebuggerState.STOPPED:
-                return False
-            
-            self._state = DebuggerState.RUNNING
-            
-            # Run in separate thread
-            threading.Thread(
-                target=self.run,
-                args=(script,),
-                name="DebuggerThread"
-            ).start()
+            with self._session_lock:
+                # Refuse while the previous session is still unwinding
+                if (self._state != DebuggerState.STOPPED or
+                        self._active_session is not None):
+                    return False
+                
+                self._session += 1
+                session = self._active_session = self._session
+                self._state = DebuggerState.RUNNING
+                self._script_lines = script.splitlines()
+                
+                # Hand off to the worker thread
+                if not self._worker_thread or not self._worker_thread.is_alive():
+                    self._worker_thread = threading.Thread(
+                        target=self._worker,
+                        name="DebuggerThread",
+                        daemon=True
+                    )
+                    self._worker_thread.start()
+                self._job_queue.put((session, script))
             
             return True
             
@@ -97,6 +115,28 @@ class MacroDebugger(bdb.Bdb):
             self.logger.error(f"Failed to start debugger: {e}")
             return False
 
+    def _worker(self):
+        """Run queued debug sessions one at a time."""
+        while True:
+            job = self._job_queue.get()
+            if job is None:
+                break
+            
+            session, script = job
+            try:
+                self.run(script)
+            except SystemExit:
+                pass
+            except Exception as e:
+                self.logger.error(f"Debug session error: {e}")
+            finally:
+                # Only reset state that still belongs to this session
+                with self._session_lock:
+                    if self._active_session == session:
+                        self._current_frame = None
+                        self._state = DebuggerState.STOPPED
+                        self._active_session = None
+
     def stop(self) -> bool:
         """Stop debugging."""
         try:
@@ -105,6 +145,7 @@ class MacroDebugger(bdb.Bdb):
             
             self._state = DebuggerState.STOPPED
             self.set_quit()
+            self._resume_event.set()
             return True
             
         except Exception as e:
@@ -118,6 +159,7 @@ class MacroDebugger(bdb.Bdb):
                 return False
             
             self._state = DebuggerState.PAUSED
+            self._resume_event.clear()
             return True
             
         except Exception as e:
@@ -132,6 +174,7 @@ class MacroDebugger(bdb.Bdb):
             
             self._state = DebuggerState.RUNNING
             self._step_mode = False
+            self._resume_event.set()
             return True
             
         except Exception as e:
@@ -146,6 +189,7 @@ class MacroDebugger(bdb.Bdb):
             
             self._state = DebuggerState.STEPPING
             self._step_mode = True
+            self._resume_event.set()
             return True
             
         except Exception as e:
@@ -158,12 +202,17 @@ class MacroDebugger(bdb.Bdb):
         try:
             bp = Breakpoint(
                 id=self._next_breakpoint_id,
-                file=file,
+                file=sys.intern(file),
                 line=line,
                 condition=condition
             )
+            if condition:
+                bp.compiled_condition = compile(
+                    condition, f"<bp{bp.id}>", 'eval'
+                )
             
             self._breakpoints[bp.id] = bp
+            self._bp_index.setdefault((bp.file, bp.line), []).append(bp)
             self._next_breakpoint_id += 1
             
             return bp.id
@@ -175,10 +224,16 @@ class MacroDebugger(bdb.Bdb):
     def remove_breakpoint(self, id: int) -> bool:
         """Remove breakpoint."""
         try:
-            if id not in self._breakpoints:
+            bp = self._breakpoints.pop(id, None)
+            if bp is None:
                 return False
             
-            del self._breakpoints[id]
+            key = (bp.file, bp.line)
+            bps = self._bp_index.get(key)
+            if bps:
+                bps.remove(bp)
+                if not bps:
+                    del self._bp_index[key]
             return True
             
         except Exception as e:
@@ -208,32 +263,44 @@ class MacroDebugger(bdb.Bdb):
             self.logger.error(f"Failed to remove watch: {e}")
             return False
 
-    def get_variables(self) -> List[Variable]:
-        """Get current variables."""
+    def get_variables(self, scope: Optional[str] = None,
+                      name_filter: Optional[Callable[[str], bool]] = None,
+                      include_private: bool = True) -> List[Variable]:
+        """Get current variables (locals first, then globals)."""
         try:
-            if not self._current_frame:
+            frame = self._current_frame
+            if not frame:
                 return []
             
+            # Each f_locals access re-syncs fast locals, so read it once
+            f_locals = frame.f_locals
+            f_globals = frame.f_globals
             variables = []
+            append = variables.append
+            make_variable = Variable
+            type_of = type
             
             # Local variables
-            for name, value in self._current_frame.f_locals.items():
-                variables.append(Variable(
-                    name=name,
-                    value=value,
-                    type=type(value).__name__,
-                    scope='local'
-                ))
-            
-            # Global variables
-            for name, value in self._current_frame.f_globals.items():
-                if name not in self._current_frame.f_locals:
-                    variables.append(Variable(
-                        name=name,
-                        value=value,
-                        type=type(value).__name__,
-                        scope='global'
-                    ))
+            if scope in (None, 'local'):
+                for name, value in f_locals.items():
+                    if not include_private and name[:1] == '_':
+                        continue
+                    if name_filter and not name_filter(name):
+                        continue
+                    append(make_variable(name, value,
+                                         type_of(value).__name__, 'local'))
+            
+            # Global variables not shadowed by locals
+            if scope in (None, 'global'):
+                for name, value in f_globals.items():
+                    if name in f_locals:
+                        continue
+                    if not include_private and name[:1] == '_':
+                        continue
+                    if name_filter and not name_filter(name):
+                        continue
+                    append(make_variable(name, value,
+                                         type_of(value).__name__, 'global'))
             
             return variables
             
@@ -248,13 +315,14 @@ class MacroDebugger(bdb.Bdb):
                 return []
             
             stack = []
+            stack_append = stack.append
+            join = ''.join
             frame = self._current_frame
             
             while frame:
-                stack.append(
-                    f"{frame.f_code.co_filename}:{frame.f_lineno} "
-                    f"in {frame.f_code.co_name}"
-                )
+                code = frame.f_code
+                stack_append(join((code.co_filename, ':', str(frame.f_lineno),
+                                   ' in ', code.co_name)))
                 frame = frame.f_back
             
             return stack
@@ -266,13 +334,20 @@ class MacroDebugger(bdb.Bdb):
     def get_current_line(self) -> Optional[str]:
         """Get current source line."""
         try:
-            if not self._current_frame:
+            frame = self._current_frame
+            if not frame:
                 return None
             
-            return linecache.getline(
-                self._current_frame.f_code.co_filename,
-                self._current_frame.f_lineno
-            ).strip()
+            filename = frame.f_code.co_filename
+            lineno = frame.f_lineno
+            
+            # Debugged script lines are cached by start()
+            if filename == self._script_file:
+                if 0 < lineno <= len(self._script_lines):
+                    return self._script_lines[lineno - 1].strip()
+                return ''
+            
+            return linecache.getline(filename, lineno).strip()
             
         except Exception as e:
             self.logger.error(f"Failed to get line: {e}")
@@ -298,17 +373,20 @@ class MacroDebugger(bdb.Bdb):
         """Handle line event."""
         try:
             self._current_frame = frame
-            
-            # Check breakpoints
-            for bp in self._breakpoints.values():
-                if (bp.enabled and
-                    bp.file == frame.f_code.co_filename and
-                    bp.line == frame.f_lineno):
+            filename = frame.f_code.co_filename
+            lineno = frame.f_lineno
+            
+            # Check breakpoints at this location
+            bps = self._bp_index.get((filename, lineno))
+            if bps:
+                for bp in bps:
+                    if not bp.enabled:
+                        continue
                     
                     # Check condition
-                    if bp.condition:
+                    if bp.compiled_condition:
                         try:
-                            if not eval(bp.condition,
+                            if not eval(bp.compiled_condition,
                                       frame.f_globals,
                                       frame.f_locals):
                                 continue
@@ -319,23 +397,27 @@ class MacroDebugger(bdb.Bdb):
                     self._state = DebuggerState.PAUSED
             
             # Check watched variables
-            for var in self._watch_variables:
-                if var in frame.f_locals:
-                    if self._on_variable_changed:
-                        self._on_variable_changed(var, frame.f_locals[var])
+            on_variable_changed = self._on_variable_changed
+            if self._watch_variables and on_variable_changed:
+                f_locals = frame.f_locals
+                for var in self._watch_variables:
+                    if var in f_locals:
+                        on_variable_changed(var, f_locals[var])
             
             # Notify line event
             if self._on_line:
-                self._on_line(frame.f_code.co_filename, frame.f_lineno)
+                self._on_line(filename, lineno)
             
             # Handle stepping
             if self._step_mode:
                 self._state = DebuggerState.PAUSED
                 self._step_mode = False
             
-            # Wait if paused
-            while self._state == DebuggerState.PAUSED:
-                time.sleep(0.1)
+            # Wait if paused (resume/step/stop set the event)
+            if self._state == DebuggerState.PAUSED:
+                self._resume_event.clear()
+                while self._state == DebuggerState.PAUSED:
+                    self._resume_event.wait()
                 if self._state == DebuggerState.STOPPED:
                     sys.exit()
             
@@ -364,7 +446,11 @@ class MacroDebugger(bdb.Bdb):
         """Clean up resources."""
         try:
             self.stop()
+            if self._worker_thread and self._worker_thread.is_alive():
+                self._job_queue.put(None)
+                self._worker_thread.join(timeout=1.0)
             self._breakpoints.clear()
+            self._bp_index.clear()
             self._watch_variables.clear()
             self._current_frame = None
             
@@ -373,3 +459,7 @@ class MacroDebugger(bdb.Bdb):
 
 # Global instance
 macro_debugger = MacroDebugger()
+
+def get_macro_debugger() -> MacroDebugger:
+    """Get global macro debugger instance."""
+    return macro_debugger
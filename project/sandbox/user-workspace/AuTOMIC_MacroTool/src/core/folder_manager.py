@@ -4,6 +4,7 @@ Copyright (c) 2025 AtomicArk
 """
 
 import logging
+import sys
 import threading
 from typing import Dict, List, Optional, Set, Union
 from pathlib import Path
@@ -11,12 +12,48 @@ import json
 import shutil
 import os
 import time
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..utils.debug_helper import get_debug_helper
 
-class FolderNode:
+def _trigrams(text: str) -> Set[str]:
+    """Get all 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class _NodeText:
+    """Name/description storage with pre-lowered copies for search."""
+    
+    __slots__ = ('_name', '_name_lower', '_description', '_desc_lower')
+    
+    @property
+    def name(self) -> str:
+        return self._name
+    
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+        self._name_lower = value.lower()
+    
+    @property
+    def description(self) -> str:
+        return self._description
+    
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+        self._desc_lower = value.lower()
+
+class FolderNode(_NodeText):
     """Represents a folder in the macro hierarchy."""
     
+    __slots__ = ('parent', 'children', 'tags', 'created', 'modified',
+                 '_cached_path')
+    
     def __init__(self, name: str, parent: Optional['FolderNode'] = None):
         self.name = name
         self.parent = parent
@@ -25,14 +62,16 @@ class FolderNode:
         self.description: str = ""
         self.created: float = time.time()
         self.modified: float = self.created
+        self._cached_path: Optional[str] = None
 
     def add_child(self, name: str, node: Union['FolderNode', 'MacroNode']) -> bool:
         """Add child node."""
         if name in self.children:
             return False
-        self.children[name] = node
+        self.children[sys.intern(name)] = node
         if isinstance(node, FolderNode):
             node.parent = self
+            node._invalidate_path()
         self.modified = time.time()
         return True
 
@@ -40,41 +79,76 @@ class FolderNode:
         """Remove child node."""
         if name not in self.children:
             return False
-        del self.children[name]
+        node = self.children.pop(name)
+        if isinstance(node, FolderNode):
+            node._invalidate_path()
         self.modified = time.time()
         return True
 
     def get_path(self) -> str:
         """Get full path from root."""
-        if self.parent:
-            return os.path.join(self.parent.get_path(), self.name)
-        return self.name
+        path = self._cached_path
+        if path is None:
+            if self.parent:
+                path = self.parent.get_path() + '/' + self.name
+            else:
+                path = self.name
+            self._cached_path = path
+        return path
+
+    def _invalidate_path(self) -> None:
+        """Drop cached paths of this folder and its subfolders."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._cached_path = None
+            stack.extend(child for child in node.children.values()
+                         if isinstance(child, FolderNode))
 
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return {
-            'name': self.name,
-            'type': 'folder',
-            'children': {name: node.to_dict() for name, node in self.children.items()},
-            'tags': list(self.tags),
-            'description': self.description,
-            'created': self.created,
-            'modified': self.modified
-        }
+        """Convert to dictionary (including all descendants)."""
+        result = None
+        stack = [(self, None, None)]
+        while stack:
+            node, siblings, name = stack.pop()
+            if isinstance(node, FolderNode):
+                data = {
+                    'name': node.name,
+                    'type': 'folder',
+                    'children': {},
+                    'tags': list(node.tags),
+                    'description': node.description,
+                    'created': node.created,
+                    'modified': node.modified
+                }
+                # Reversed so children pop (and serialize) in order
+                children = data['children']
+                stack.extend((child, children, child_name) for child_name, child
+                             in reversed(node.children.items()))
+            else:
+                data = node.to_dict()
+            
+            if siblings is None:
+                result = data
+            else:
+                siblings[name] = data
+        return result
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'FolderNode':
         """Create from dictionary."""
-        node = cls(data['name'])
-        node.tags = set(data.get('tags', []))
+        node = cls(sys.intern(data['name']))
+        node.tags = {sys.intern(tag) for tag in data.get('tags', [])}
         node.description = data.get('description', '')
         node.created = data.get('created', 0.0)
         node.modified = data.get('modified', 0.0)
         return node
 
-class MacroNode:
+class MacroNode(_NodeText):
     """Represents a macro in the hierarchy."""
     
+    __slots__ = ('macro_id', 'tags', 'created', 'modified')
+    
     def __init__(self, name: str, macro_id: str):
         self.name = name
         self.macro_id = macro_id
@@ -98,8 +172,8 @@ class MacroNode:
     @classmethod
     def from_dict(cls, data: Dict) -> 'MacroNode':
         """Create from dictionary."""
-        node = cls(data['name'], data['macro_id'])
-        node.tags = set(data.get('tags', []))
+        node = cls(sys.intern(data['name']), data['macro_id'])
+        node.tags = {sys.intern(tag) for tag in data.get('tags', [])}
         node.description = data.get('description', '')
         node.created = data.get('created', 0.0)
         node.modified = data.get('modified', 0.0)
@@ -108,34 +182,50 @@ class MacroNode:
 class FolderManager:
     """Manages macro folder hierarchy."""
     
-    _instance = None
-    _lock = threading.Lock()
+    _instance: Optional['FolderManager'] = None
+    _instance_lock = threading.Lock()
     
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super().__new__(cls)
-            return cls._instance
+    # Delay before writing coalesced changes (seconds)
+    SAVE_DELAY = 0.5
+    
+    @classmethod
+    def instance(cls) -> 'FolderManager':
+        """Get shared instance, creating it on first use."""
+        inst = cls._instance
+        if inst is None:
+            with cls._instance_lock:
+                inst = cls._instance
+                if inst is None:
+                    inst = cls._instance = cls()
+        return inst
 
     def __init__(self):
-        if not hasattr(self, '_initialized'):
-            self.logger = logging.getLogger('FolderManager')
-            self.debug = get_debug_helper()
-            
-            # Root folder
-            self._root = FolderNode('root')
-            
-            # Cache
-            self._path_cache: Dict[str, Union[FolderNode, MacroNode]] = {}
-            self._tag_cache: Dict[str, Set[Union[FolderNode, MacroNode]]] = {}
-            
-            # State
-            self._modified = False
-            self._storage_path = Path.home() / '.atomic_macro' / 'folders'
-            
-            # Initialize
-            self._load_structure()
-            self._initialized = True
+        self.logger = logging.getLogger('FolderManager')
+        self.debug = get_debug_helper()
+        self._lock = threading.Lock()
+        
+        # Root folder
+        self._root = FolderNode('root')
+        
+        # Cache
+        self._path_cache: Dict[str, Union[FolderNode, MacroNode]] = {}
+        self._tag_cache: Dict[str, Set[Union[FolderNode, MacroNode]]] = {}
+        self._node_paths: Dict[Union[FolderNode, MacroNode], str] = {}
+        
+        # Search index (lowercase name/description trigrams). Writers
+        # replace index sets rather than mutating them, so lock-free
+        # readers never iterate a set that is changing.
+        self._trigram_index: Dict[str, Set[Union[FolderNode, MacroNode]]] = {}
+        self._node_trigrams: Dict[Union[FolderNode, MacroNode], Set[str]] = {}
+        
+        # State
+        self._modified = False
+        self._storage_path = Path.home() / '.atomic_macro' / 'folders'
+        self._save_timer: Optional[threading.Timer] = None
+        
+        # Initialize
+        self._cache_node(self._root, self._root.name)
+        self._load_structure()
 
     def create_folder(self, path: str, description: str = "") -> bool:
         """Create new folder."""
@@ -148,10 +238,13 @@ class FolderManager:
                 
                 # Navigate to parent
                 parent = self._root
+                parent_path = parent.name
                 for part in parts[:-1]:
+                    parent_path += '/' + part
                     if part not in parent.children:
                         node = FolderNode(part)
                         parent.add_child(part, node)
+                        self._cache_node(node, parent_path)
                     parent = parent.children[part]
                     if not isinstance(parent, FolderNode):
                         return False
@@ -166,9 +259,9 @@ class FolderManager:
                 parent.add_child(name, node)
                 
                 # Update cache
-                self._update_cache()
+                self._cache_node(node, parent_path + '/' + name)
                 self._modified = True
-                self._save_structure()
+                self._schedule_save()
                 
                 return True
             
@@ -187,10 +280,13 @@ class FolderManager:
                 
                 # Navigate to parent
                 parent = self._root
+                parent_path = parent.name
                 for part in parts[:-1]:
+                    parent_path += '/' + part
                     if part not in parent.children:
                         node = FolderNode(part)
                         parent.add_child(part, node)
+                        self._cache_node(node, parent_path)
                     parent = parent.children[part]
                     if not isinstance(parent, FolderNode):
                         return False
@@ -205,9 +301,9 @@ class FolderManager:
                 parent.add_child(name, node)
                 
                 # Update cache
-                self._update_cache()
+                self._cache_node(node, parent_path + '/' + name)
                 self._modified = True
-                self._save_structure()
+                self._schedule_save()
                 
                 return True
             
@@ -226,9 +322,11 @@ class FolderManager:
                 
                 # Navigate to parent
                 parent = self._root
+                parent_path = parent.name
                 for part in parts[:-1]:
                     if part not in parent.children:
                         return False
+                    parent_path += '/' + part
                     parent = parent.children[part]
                     if not isinstance(parent, FolderNode):
                         return False
@@ -238,12 +336,13 @@ class FolderManager:
                 if name not in parent.children:
                     return False
                 
+                node = parent.children[name]
                 parent.remove_child(name)
                 
                 # Update cache
-                self._update_cache()
+                self._uncache_subtree(node, parent_path + '/' + name)
                 self._modified = True
-                self._save_structure()
+                self._schedule_save()
                 
                 return True
             
@@ -251,11 +350,92 @@ class FolderManager:
             self.logger.error(f"Failed to remove node: {e}")
             return False
 
+    def rename_node(self, path: str, new_name: str) -> bool:
+        """Rename node (folder or macro)."""
+        try:
+            with self._lock:
+                # Split path
+                parts = self._split_path(path)
+                if not parts or not new_name or '/' in new_name:
+                    return False
+                
+                # Navigate to parent
+                parent = self._root
+                parent_path = parent.name
+                for part in parts[:-1]:
+                    if part not in parent.children:
+                        return False
+                    parent_path += '/' + part
+                    parent = parent.children[part]
+                    if not isinstance(parent, FolderNode):
+                        return False
+                
+                # Rename node
+                name = parts[-1]
+                if name not in parent.children or new_name in parent.children:
+                    return False
+                
+                node = parent.children[name]
+                parent.remove_child(name)
+                node.name = sys.intern(new_name)
+                node.modified = time.time()
+                parent.add_child(new_name, node)
+                
+                # Move cached paths of the node and its descendants
+                stack = [(node, parent_path + '/' + name,
+                          parent_path + '/' + new_name)]
+                while stack:
+                    node_, old_path, new_path = stack.pop()
+                    self._path_cache.pop(old_path, None)
+                    self._path_cache[new_path] = node_
+                    self._node_paths[node_] = new_path
+                    if isinstance(node_, FolderNode):
+                        stack.extend((child, old_path + '/' + child_name,
+                                      new_path + '/' + child_name)
+                                     for child_name, child in node_.children.items())
+                
+                # Update search index
+                self._reindex_node(node)
+                self._modified = True
+                self._schedule_save()
+                
+                return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to rename node: {e}")
+            return False
+
+    def set_description(self, path: str, description: str) -> bool:
+        """Set node description."""
+        try:
+            with self._lock:
+                parts = self._split_path(path)
+                if not parts:
+                    return False
+                
+                node = self._path_cache.get(self._root.name + '/' + '/'.join(parts))
+                if node is None:
+                    return False
+                
+                node.description = description
+                node.modified = time.time()
+                
+                # Update search index
+                self._reindex_node(node)
+                self._modified = True
+                self._schedule_save()
+                
+                return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to set description: {e}")
+            return False
+
     def get_node(self, path: str) -> Optional[Union[FolderNode, MacroNode]]:
         """Get node by path."""
         try:
-            with self._lock:
-                return self._path_cache.get(path)
+            # Lock-free: single dict lookup
+            return self._path_cache.get(path)
             
         except Exception as e:
             self.logger.error(f"Failed to get node: {e}")
@@ -264,8 +444,9 @@ class FolderManager:
     def find_by_tag(self, tag: str) -> List[Union[FolderNode, MacroNode]]:
         """Find nodes by tag."""
         try:
-            with self._lock:
-                return list(self._tag_cache.get(tag, set()))
+            # Lock-free: copying a set is atomic under the GIL
+            nodes = self._tag_cache.get(tag)
+            return list(nodes) if nodes else []
             
         except Exception as e:
             self.logger.error(f"Failed to find by tag: {e}")
@@ -274,16 +455,32 @@ class FolderManager:
     def search(self, query: str) -> List[Union[FolderNode, MacroNode]]:
         """Search nodes by name or description."""
         try:
-            results = []
             query = query.lower()
             
-            with self._lock:
-                for node in self._path_cache.values():
-                    if (query in node.name.lower() or
-                        query in node.description.lower()):
-                        results.append(node)
+            # Lock-free: only atomic C-level copies of shared containers
+            if len(query) < 3:
+                # Too short for trigrams, scan everything
+                candidates = list(self._path_cache.items())
+            else:
+                # Intersect trigram hits, rarest first
+                index = self._trigram_index
+                hits = []
+                for gram in _trigrams(query):
+                    nodes = index.get(gram)
+                    if not nodes:
+                        return []
+                    hits.append(nodes)
+                hits.sort(key=len)
+                node_paths = self._node_paths
+                candidates = [(node_paths.get(node, ''), node) for node
+                              in hits[0].intersection(*hits[1:])]
             
-            return results
+            # Return matches in path order
+            matches = [item for item in candidates
+                       if (query in item[1]._name_lower or
+                           query in item[1]._desc_lower)]
+            matches.sort(key=itemgetter(0))
+            return [node for _, node in matches]
             
         except Exception as e:
             self.logger.error(f"Failed to search: {e}")
@@ -295,28 +492,101 @@ class FolderManager:
             return []
         return [part for part in path.split('/') if part]
 
+    def _cache_node(self, node: Union[FolderNode, MacroNode], path: str) -> None:
+        """Add a single node to the path and tag caches."""
+        self._path_cache[path] = node
+        self._node_paths[node] = path
+        tag_cache = self._tag_cache
+        for tag in node.tags:
+            tag_cache[tag] = tag_cache.get(tag, frozenset()) | {node}
+        self._index_node(node)
+
+    def _uncache_subtree(self, node: Union[FolderNode, MacroNode],
+                         path: str) -> None:
+        """Remove a node and its descendants from the caches."""
+        stack = [(node, path)]
+        while stack:
+            node, path = stack.pop()
+            self._path_cache.pop(path, None)
+            self._node_paths.pop(node, None)
+            tag_cache = self._tag_cache
+            for tag in node.tags:
+                nodes = tag_cache.get(tag)
+                if nodes:
+                    nodes = nodes - {node}
+                    if nodes:
+                        tag_cache[tag] = nodes
+                    else:
+                        del tag_cache[tag]
+            self._unindex_node(node)
+            if isinstance(node, FolderNode):
+                stack.extend((child, path + '/' + name)
+                             for name, child in node.children.items())
+
+    def _index_node(self, node: Union[FolderNode, MacroNode]) -> None:
+        """Add a node to the search index."""
+        grams = _trigrams(node._name_lower) | _trigrams(node._desc_lower)
+        self._node_trigrams[node] = grams
+        index = self._trigram_index
+        for gram in grams:
+            index[gram] = index.get(gram, frozenset()) | {node}
+
+    def _unindex_node(self, node: Union[FolderNode, MacroNode]) -> None:
+        """Remove a node from the search index."""
+        index = self._trigram_index
+        for gram in self._node_trigrams.pop(node, ()):
+            nodes = index.get(gram)
+            if nodes:
+                nodes = nodes - {node}
+                if nodes:
+                    index[gram] = nodes
+                else:
+                    del index[gram]
+
+    def _reindex_node(self, node: Union[FolderNode, MacroNode]) -> None:
+        """Refresh search trigrams of a node after a text change."""
+        self._unindex_node(node)
+        self._index_node(node)
+
     def _update_cache(self) -> None:
         """Update path and tag caches."""
         try:
-            self._path_cache.clear()
-            self._tag_cache.clear()
+            # Build fresh caches, then publish them for lock-free readers
+            path_cache = {}
+            node_paths = {}
+            tag_cache = {}
+            trigram_index = {}
+            node_trigrams = {}
             
-            def process_node(node: Union[FolderNode, MacroNode], path: str) -> None:
+            stack = [(self._root, self._root.name)]
+            while stack:
+                node, path = stack.pop()
+                
                 # Update path cache
-                self._path_cache[path] = node
+                path_cache[path] = node
+                node_paths[node] = path
                 
                 # Update tag cache
                 for tag in node.tags:
-                    if tag not in self._tag_cache:
-                        self._tag_cache[tag] = set()
-                    self._tag_cache[tag].add(node)
+                    tag_cache.setdefault(tag, set()).add(node)
+                
+                # Update search index
+                grams = _trigrams(node._name_lower) | _trigrams(node._desc_lower)
+                node_trigrams[node] = grams
+                for gram in grams:
+                    trigram_index.setdefault(gram, set()).add(node)
                 
-                # Process children
+                # Queue children
                 if isinstance(node, FolderNode):
-                    for name, child in node.children.items():
-                        process_node(child, os.path.join(path, name))
+                    prefix = path + '/'
+                    stack.extend((child, prefix + name)
+                                 for name, child in node.children.items())
             
-            process_node(self._root, self._root.name)
+            self._path_cache = path_cache
+            self._node_paths = node_paths
+            self._tag_cache = tag_cache
+            self._trigram_index = trigram_index
+            self._node_trigrams = node_trigrams
             
         except Exception as e:
             self.logger.error(f"Failed to update cache: {e}")
@@ -328,27 +598,54 @@ class FolderManager:
             if not path.exists():
                 return
             
-            with open(path, 'r') as f:
-                data = json.load(f)
+            raw = path.read_bytes()
+            if orjson is not None:
+                data = orjson.loads(raw)
+            else:
+                data = json.loads(raw.decode('utf-8'))
             
-            def process_dict(data: Dict) -> Union[FolderNode, MacroNode]:
-                if data['type'] == 'folder':
-                    node = FolderNode.from_dict(data)
-                    for name, child_data in data['children'].items():
-                        child = process_dict(child_data)
-                        node.add_child(name, child)
-                    return node
+            # Rebuild nodes without recursion
+            root = None
+            stack = [(data, None, None)]
+            while stack:
+                node_data, parent, name = stack.pop()
+                if node_data['type'] == 'folder':
+                    node = FolderNode.from_dict(node_data)
+                    stack.extend((child_data, node, child_name)
+                                 for child_name, child_data
+                                 in reversed(node_data['children'].items()))
                 else:
-                    return MacroNode.from_dict(data)
+                    node = MacroNode.from_dict(node_data)
+                
+                if parent is None:
+                    root = node
+                else:
+                    parent.add_child(name, node)
             
-            self._root = process_dict(data)
+            self._root = root
             self._update_cache()
             
         except Exception as e:
             self.logger.error(f"Failed to load structure: {e}")
 
+    def _schedule_save(self) -> None:
+        """Schedule a deferred save, restarting the delay (lock held)."""
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._save_structure()
+
     def _save_structure(self) -> None:
-        """Save folder structure to disk."""
+        """Save folder structure to disk (lock held)."""
         try:
             if not self._modified:
                 return
@@ -356,10 +653,16 @@ class FolderManager:
             # Create directory
             self._storage_path.mkdir(parents=True, exist_ok=True)
             
-            # Save structure
+            # Write to a temporary file, then move it into place
             path = self._storage_path / 'structure.json'
-            with open(path, 'w') as f:
-                json.dump(self._root.to_dict(), f, indent=2)
+            tmp_path = path.with_suffix('.json.tmp')
+            if orjson is not None:
+                data = orjson.dumps(self._root.to_dict(),
+                                    option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self._root.to_dict(), indent=2).encode('utf-8')
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
             
             self._modified = False
             
@@ -369,10 +672,10 @@ class FolderManager:
     def cleanup(self):
         """Clean up resources."""
         try:
-            self._save_structure()
+            self.flush()
             
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
 
 # Global instance
-folder_manager = FolderManager()
+folder_manager = FolderManager.instance()
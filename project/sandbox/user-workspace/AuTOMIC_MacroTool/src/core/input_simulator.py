@@ -4,22 +4,35 @@ Copyright (c) 2025 AtomicArk
 """
 
 import logging
+import importlib.util
 import threading
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum, auto
 import time
-import ctypes
 import win32api
-import win32con
 import keyboard
 import mouse
-from pynput import keyboard as pynput_keyboard
-from pynput import mouse as pynput_mouse
 
+from ..utils.compat import DATACLASS_SLOTS
 from ..utils.debug_helper import get_debug_helper
 from ..core.config_manager import config_manager
 
+@lru_cache(maxsize=512)
+def _scan_code(key: str) -> int:
+    """Get scan code for key name."""
+    return keyboard.key_to_scan_codes(key)[0]
+
+def _wait_until(deadline: float) -> None:
+    """Wait until a perf_counter deadline (sleep coarse, spin fine)."""
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+
 class InputType(Enum):
     """Input event types."""
     KEYBOARD = auto()
@@ -34,7 +47,26 @@ class MouseButton(Enum):
     RIGHT = auto()
     MIDDLE = auto()
 
-@dataclass
+# Button name -> MouseButton
+_STR_BTN = {
+    'left': MouseButton.LEFT,
+    'right': MouseButton.RIGHT,
+    'middle': MouseButton.MIDDLE
+}
+
+# MouseButton -> Interception button state / mouse library name
+_STEALTH_BTN = {
+    MouseButton.LEFT: 1,
+    MouseButton.RIGHT: 2,
+    MouseButton.MIDDLE: 4
+}
+_MOUSE_BTN = {
+    MouseButton.LEFT: 'left',
+    MouseButton.RIGHT: 'right',
+    MouseButton.MIDDLE: 'middle'
+}
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class InputEvent:
     """Input event container."""
     type: InputType
@@ -51,6 +83,18 @@ class StealthMode:
         self.logger = logging.getLogger('StealthMode')
         self._initialized = False
         
+        # Reusable strokes (never mutated after creation)
+        self._key_strokes: Dict[Tuple[int, bool], object] = {}
+        self._button_strokes: Dict[Tuple[int, int], object] = {}
+        
+        # Cleared if the bindings reject a list of strokes
+        self._batch_send = True
+        
+        # Check presence without importing the driver bindings
+        if importlib.util.find_spec('interception') is None:
+            self.logger.info("Interception driver bindings not installed")
+            return
+        
         try:
             import interception
             self._interception = interception.Interception()
@@ -62,22 +106,61 @@ class StealthMode:
         """Check if stealth mode is available."""
         return self._initialized
 
-    def send_keyboard(self, scan_code: int, key_down: bool) -> bool:
-        """Send keyboard input."""
+    def close(self) -> None:
+        """Release the driver context."""
         try:
             if not self._initialized:
-                return False
+                return
             
+            self._initialized = False
+            self._interception.destroy()
+            
+        except Exception as e:
+            self.logger.error(f"Failed to close stealth mode: {e}")
+
+    def key_stroke(self, scan_code: int, key_down: bool) -> object:
+        """Build a keyboard stroke."""
+        stroke = self._key_strokes.get((scan_code, key_down))
+        if stroke is None:
             stroke = self._interception.KeyStroke(
                 code=scan_code,
                 state=1 if key_down else 0
             )
-            return self._interception.send(stroke)
+            self._key_strokes[(scan_code, key_down)] = stroke
+        return stroke
+
+    def send_keyboard(self, scan_code: int, key_down: bool) -> bool:
+        """Send keyboard input."""
+        try:
+            if not self._initialized:
+                return False
+            
+            return self._interception.send(self.key_stroke(scan_code, key_down))
             
         except Exception as e:
             self.logger.error(f"Failed to send keyboard input: {e}")
             return False
 
+    def mouse_stroke(self, x: int, y: int, buttons: int = 0,
+                     wheel: int = 0) -> object:
+        """Build a mouse stroke."""
+        # Button/wheel-only strokes repeat, so reuse them
+        if x == 0 and y == 0:
+            stroke = self._button_strokes.get((buttons, wheel))
+            if stroke is None:
+                stroke = self._interception.MouseStroke(
+                    x=0, y=0, state=buttons, rolling=wheel
+                )
+                self._button_strokes[(buttons, wheel)] = stroke
+            return stroke
+        
+        return self._interception.MouseStroke(
+            x=x,
+            y=y,
+            state=buttons,
+            rolling=wheel
+        )
+
     def send_mouse(self, x: int, y: int, buttons: int = 0,
                   wheel: int = 0) -> bool:
         """Send mouse input."""
@@ -85,18 +168,37 @@ class StealthMode:
             if not self._initialized:
                 return False
             
-            stroke = self._interception.MouseStroke(
-                x=x,
-                y=y,
-                state=buttons,
-                rolling=wheel
+            return self._interception.send(
+                self.mouse_stroke(x, y, buttons, wheel)
             )
-            return self._interception.send(stroke)
             
         except Exception as e:
             self.logger.error(f"Failed to send mouse input: {e}")
             return False
 
+    def send_many(self, strokes: List[object]) -> bool:
+        """Send several strokes in one driver call."""
+        try:
+            if not self._initialized:
+                return False
+            
+            if not strokes:
+                return True
+            
+            if self._batch_send:
+                try:
+                    return self._interception.send(strokes)
+                except TypeError:
+                    # Bindings only take single strokes
+                    self._batch_send = False
+            
+            send = self._interception.send
+            return all(send(stroke) for stroke in strokes)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to send input batch: {e}")
+            return False
+
 class InputSimulator:
     """Simulates keyboard and mouse input."""
     
@@ -104,6 +206,11 @@ class InputSimulator:
     _lock = threading.Lock()
     
     def __new__(cls):
+        # Fast path once created
+        inst = cls._instance
+        if inst is not None:
+            return inst
+        
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
@@ -118,8 +225,8 @@ class InputSimulator:
             self._stealth_mode = StealthMode()
             self._use_stealth = False
             self._last_pos: Optional[Tuple[int, int]] = None
-            self._pressed_keys: Dict[str, bool] = {}
-            self._pressed_buttons: Dict[MouseButton, bool] = {}
+            self._held_keys: Set[str] = set()
+            self._held_buttons: Set[MouseButton] = set()
             
             # Initialize
             self._initialized = True
@@ -143,7 +250,7 @@ class InputSimulator:
         try:
             if self._use_stealth:
                 # Convert key to scan code
-                scan_code = keyboard.key_to_scan_codes(key)[0]
+                scan_code = _scan_code(key)
                 
                 # Press key
                 if not self._stealth_mode.send_keyboard(scan_code, True):
@@ -170,18 +277,18 @@ class InputSimulator:
     def key_down(self, key: str) -> bool:
         """Simulate key down."""
         try:
-            if key in self._pressed_keys and self._pressed_keys[key]:
+            if key in self._held_keys:
                 return True
             
             if self._use_stealth:
-                scan_code = keyboard.key_to_scan_codes(key)[0]
+                scan_code = _scan_code(key)
                 result = self._stealth_mode.send_keyboard(scan_code, True)
             else:
                 keyboard.press(key)
                 result = True
             
             if result:
-                self._pressed_keys[key] = True
+                self._held_keys.add(key)
             
             return result
             
@@ -192,18 +299,18 @@ class InputSimulator:
     def key_up(self, key: str) -> bool:
         """Simulate key up."""
         try:
-            if key not in self._pressed_keys or not self._pressed_keys[key]:
+            if key not in self._held_keys:
                 return True
             
             if self._use_stealth:
-                scan_code = keyboard.key_to_scan_codes(key)[0]
+                scan_code = _scan_code(key)
                 result = self._stealth_mode.send_keyboard(scan_code, False)
             else:
                 keyboard.release(key)
                 result = True
             
             if result:
-                self._pressed_keys[key] = False
+                self._held_keys.discard(key)
             
             return result
             
@@ -226,22 +333,35 @@ class InputSimulator:
                 target_y = y
             
             if duration:
-                # Smooth movement
-                steps = int(duration * 60)  # 60 FPS
-                dx = (target_x - current_x) / steps
-                dy = (target_y - current_y) / steps
+                # Smooth movement (path computed up front)
+                import numpy as np
+                steps = max(1, int(duration * 60))  # 60 FPS
+                dt = duration / steps
+                xs = np.linspace(current_x, target_x, steps,
+                                 endpoint=False).astype(np.int64).tolist()
+                ys = np.linspace(current_y, target_y, steps,
+                                 endpoint=False).astype(np.int64).tolist()
                 
-                for i in range(steps):
-                    x = int(current_x + dx * i)
-                    y = int(current_y + dy * i)
+                # Step against an absolute schedule so sleep overshoot
+                # does not accumulate
+                t0 = time.perf_counter()
+                if self._use_stealth:
+                    make_stroke = self._stealth_mode.mouse_stroke
+                    strokes = [make_stroke(sx, sy) for sx, sy in zip(xs, ys)]
                     
-                    if self._use_stealth:
-                        if not self._stealth_mode.send_mouse(x, y):
+                    # Send every step that is due in one driver call
+                    sent = 0
+                    while sent < steps:
+                        due = min(steps,
+                                  int((time.perf_counter() - t0) / dt) + 1)
+                        if not self._stealth_mode.send_many(strokes[sent:due]):
                             return False
-                    else:
-                        win32api.SetCursorPos((x, y))
-                    
-                    time.sleep(duration / steps)
+                        sent = due
+                        _wait_until(t0 + sent * dt)
+                else:
+                    for i in range(steps):
+                        win32api.SetCursorPos((xs[i], ys[i]))
+                        _wait_until(t0 + (i + 1) * dt)
             
             # Final position
             if self._use_stealth:
@@ -264,21 +384,16 @@ class InputSimulator:
         """Simulate mouse click."""
         try:
             # Convert string to enum
-            if isinstance(button, str):
-                button = MouseButton[button.upper()]
+            if type(button) is str:
+                button = _STR_BTN[button.lower()]
             
             # Get button state
-            if button in self._pressed_buttons and self._pressed_buttons[button]:
+            if button in self._held_buttons:
                 return True
             
             # Map buttons
             if self._use_stealth:
-                button_map = {
-                    MouseButton.LEFT: 1,
-                    MouseButton.RIGHT: 2,
-                    MouseButton.MIDDLE: 4
-                }
-                buttons = button_map[button]
+                buttons = _STEALTH_BTN[button]
                 
                 # Click
                 if not self._stealth_mode.send_mouse(0, 0, buttons):
@@ -290,17 +405,13 @@ class InputSimulator:
                 return self._stealth_mode.send_mouse(0, 0, 0)
             
             else:
-                button_map = {
-                    MouseButton.LEFT: 'left',
-                    MouseButton.RIGHT: 'right',
-                    MouseButton.MIDDLE: 'middle'
-                }
-                mouse.press(button=button_map[button])
+                mouse_button = _MOUSE_BTN[button]
+                mouse.press(button=mouse_button)
                 
                 if duration:
                     time.sleep(duration)
                 
-                mouse.release(button=button_map[button])
+                mouse.release(button=mouse_button)
                 return True
             
         except Exception as e:
@@ -320,6 +431,91 @@ class InputSimulator:
             self.logger.error(f"Failed to simulate mouse wheel: {e}")
             return False
 
+    def simulate_events(self, events: List[InputEvent]) -> int:
+        """Simulate events back to back, batching stealth strokes.
+        
+        Window targeting and relative coordinates are resolved by the
+        caller. Returns the number of events simulated successfully.
+        """
+        try:
+            if not self._use_stealth:
+                count = 0
+                for event in events:
+                    if self._simulate_event(event):
+                        count += 1
+                return count
+            
+            stealth = self._stealth_mode
+            key_stroke = stealth.key_stroke
+            mouse_stroke = stealth.mouse_stroke
+            held_keys = set(self._held_keys)
+            held_buttons = self._held_buttons
+            last_pos = self._last_pos
+            
+            # Build every stroke first, then send them in one driver call
+            strokes = []
+            count = 0
+            for event in events:
+                data = event.data
+                event_type = event.type
+                
+                if event_type is InputType.KEYBOARD:
+                    key = data['key']
+                    if data['action'] == 'press':
+                        if key not in held_keys:
+                            strokes.append(key_stroke(_scan_code(key), True))
+                            held_keys.add(key)
+                    elif key in held_keys:
+                        strokes.append(key_stroke(_scan_code(key), False))
+                        held_keys.discard(key)
+                elif event_type is InputType.MOUSE_MOVE:
+                    last_pos = (data['x'], data['y'])
+                    strokes.append(mouse_stroke(*last_pos))
+                elif event_type is InputType.MOUSE_CLICK:
+                    button = MouseButton[data['button']]
+                    if data['action'] == 'press' and button not in held_buttons:
+                        strokes.append(mouse_stroke(0, 0, _STEALTH_BTN[button]))
+                        strokes.append(mouse_stroke(0, 0, 0))
+                elif event_type is InputType.MOUSE_SCROLL:
+                    strokes.append(mouse_stroke(0, 0, wheel=data['dy']))
+                else:
+                    continue
+                count += 1
+            
+            if not stealth.send_many(strokes):
+                return 0
+            
+            self._held_keys = held_keys
+            self._last_pos = last_pos
+            return count
+            
+        except Exception as e:
+            self.logger.error(f"Failed to simulate events: {e}")
+            return 0
+
+    def _simulate_event(self, event: InputEvent) -> bool:
+        """Simulate a single event."""
+        data = event.data
+        event_type = event.type
+        
+        if event_type is InputType.KEYBOARD:
+            if data['action'] == 'press':
+                return self.key_down(data['key'])
+            return self.key_up(data['key'])
+        
+        if event_type is InputType.MOUSE_MOVE:
+            return self.mouse_move(data['x'], data['y'])
+        
+        if event_type is InputType.MOUSE_CLICK:
+            if data['action'] == 'press':
+                return self.mouse_click(MouseButton[data['button']])
+            return True
+        
+        if event_type is InputType.MOUSE_SCROLL:
+            return self.mouse_scroll(data['dy'])
+        
+        return False
+
     def get_cursor_pos(self) -> Optional[Tuple[int, int]]:
         """Get current cursor position."""
         try:
@@ -342,15 +538,27 @@ class InputSimulator:
     def release_all(self) -> None:
         """Release all pressed keys and buttons."""
         try:
+            if self._use_stealth:
+                stealth = self._stealth_mode
+                
+                # One driver call for every held key and button
+                strokes = [stealth.key_stroke(_scan_code(key), False)
+                           for key in self._held_keys]
+                if self._held_buttons:
+                    strokes.append(stealth.mouse_stroke(0, 0, 0))
+                
+                if stealth.send_many(strokes):
+                    self._held_keys.clear()
+                    self._held_buttons.clear()
+                    return
+            
             # Release keys
-            for key in list(self._pressed_keys.keys()):
-                if self._pressed_keys[key]:
-                    self.key_up(key)
+            for key in list(self._held_keys):
+                self.key_up(key)
             
             # Release buttons
-            for button in list(self._pressed_buttons.keys()):
-                if self._pressed_buttons[button]:
-                    self.mouse_click(button)
+            for button in list(self._held_buttons):
+                self.mouse_click(button)
             
         except Exception as e:
             self.logger.error(f"Failed to release all inputs: {e}")
@@ -359,6 +567,7 @@ class InputSimulator:
         """Clean up resources."""
         try:
             self.release_all()
+            self._stealth_mode.close()
             
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
@@ -5,21 +5,83 @@ Copyright (c) 2025 AtomicArk
 
 import logging
 import json
+import os
 import threading
 import time
-import shutil
-from typing import Dict, List, Optional, Tuple, Any
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple, Any
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from datetime import datetime
+from enum import Enum
 import hashlib
 
+# Saved files start with the checksum, followed by the hashed payload
+_CHECKSUM_PREFIX = b'{"checksum":"'
+
+# Checksum algorithm tag (untagged checksums are SHA-256)
+_BLAKE2B_TAG = 'blake2b:'
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ..utils.compat import DATACLASS_SLOTS
 from ..utils.debug_helper import get_debug_helper
 from .config_manager import config_manager
-from .input_simulator import InputEvent
+from .input_simulator import InputEvent, InputType
 from .recorder import RecordingMode
 
-@dataclass
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses and enums for the stdlib json fallback."""
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    
+    # Match orjson output so checksums agree either way
+    return json.dumps(
+        data,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':'),
+        ensure_ascii=False,
+        default=_json_default
+    ).encode('utf-8')
+
+def _macro_payload(macro: 'MacroData') -> bytes:
+    """Serialize the checksummed part of a macro."""
+    return _dumps({
+        'metadata': macro.metadata,
+        'events': macro.events,
+        'script': macro.script
+    })
+
+def _legacy_payload(macro: 'MacroData') -> bytes:
+    """Serialize a macro the way SHA-256 checksums were computed."""
+    return json.dumps({
+        'metadata': asdict(macro.metadata),
+        'events': [asdict(e) for e in macro.events],
+        'script': macro.script
+    }, sort_keys=True, default=_json_default).encode()
+
+def _loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+@dataclass(**DATACLASS_SLOTS)
 class MacroMetadata:
     """Macro metadata."""
     name: str
@@ -42,7 +104,7 @@ class MacroMetadata:
         if self.tags is None:
             self.tags = []
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MacroData:
     """Macro data container."""
     metadata: MacroMetadata
@@ -57,6 +119,11 @@ class MacroManager:
     _lock = threading.Lock()
     
     def __new__(cls):
+        # Fast path once created
+        inst = cls._instance
+        if inst is not None:
+            return inst
+        
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
@@ -71,11 +138,17 @@ class MacroManager:
             self._macros: Dict[str, MacroData] = {}
             self._slots: Dict[int, str] = {}  # slot -> macro_id
             self._hotkeys: Dict[str, str] = {}  # hotkey -> macro_id
+            self._list_cache: Optional[Tuple[Tuple[str, MacroMetadata], ...]] = None
+            
+            # Unsaved changes
+            self._dirty: Set[str] = set()
+            self._saved_checksums: Dict[str, str] = {}  # macro_id -> on disk
             
             # Auto-save
-            self._last_save = time.time()
+            self._last_save = time.monotonic()
             self._save_interval = 300  # 5 minutes
             self._max_backups = 10
+            self._backup_thread: Optional[threading.Thread] = None
             
             # Initialize
             self._init_storage()
@@ -90,22 +163,25 @@ class MacroManager:
                 macro_dir = Path.home() / "Documents" / "AuTOMIC_MacroTool" / "macros"
             macro_dir.mkdir(parents=True, exist_ok=True)
             
-            # Load existing macros
-            for file in macro_dir.glob("*.atomic"):
-                try:
-                    macro = self.load_macro(file)
-                    if macro:
-                        self._macros[file.stem] = macro
-                        
-                        # Register slot
-                        if macro.metadata.slot is not None:
-                            self._slots[macro.metadata.slot] = file.stem
-                        
-                        # Register hotkey
-                        if macro.metadata.hotkey:
-                            self._hotkeys[macro.metadata.hotkey] = file.stem
-                except Exception as e:
-                    self.logger.error(f"Failed to load macro {file}: {e}")
+            # Load existing macros (in parallel, registered in file order)
+            files = list(macro_dir.glob("*.atomic"))
+            with ThreadPoolExecutor(max_workers=min(8, len(files) or 1)) as executor:
+                macros = list(executor.map(self.load_macro, files))
+            
+            for file, macro in zip(files, macros):
+                if not macro:
+                    continue
+                
+                self._macros[file.stem] = macro
+                self._saved_checksums[file.stem] = macro.checksum
+                
+                # Register slot
+                if macro.metadata.slot is not None:
+                    self._slots[macro.metadata.slot] = file.stem
+                
+                # Register hotkey
+                if macro.metadata.hotkey:
+                    self._hotkeys[macro.metadata.hotkey] = file.stem
             
         except Exception as e:
             self.logger.error(f"Failed to initialize storage: {e}")
@@ -116,7 +192,7 @@ class MacroManager:
         """Create new macro."""
         try:
             # Generate ID
-            macro_id = hashlib.md5(name.encode()).hexdigest()[:8]
+            macro_id = hashlib.blake2b(name.encode(), digest_size=4).hexdigest()
             
             # Create metadata if not provided
             if not metadata:
@@ -129,12 +205,11 @@ class MacroManager:
                 script=script
             )
             
-            # Calculate checksum
-            macro.checksum = self._calculate_checksum(macro)
-            
-            # Save macro
+            # Save macro (checksummed when written)
             with self._lock:
                 self._macros[macro_id] = macro
+                self._list_cache = None
+                self._dirty.add(macro_id)
                 
                 # Register slot
                 if metadata.slot is not None:
@@ -195,8 +270,9 @@ class MacroManager:
                 # Update modification time
                 macro.metadata.modified = datetime.now().isoformat()
                 
-                # Update checksum
-                macro.checksum = self._calculate_checksum(macro)
+                # Checksum is recomputed when written
+                self._dirty.add(macro_id)
+                self._list_cache = None
                 
                 self._auto_save()
                 return True
@@ -229,6 +305,9 @@ class MacroManager:
                 
                 # Remove from memory
                 del self._macros[macro_id]
+                self._list_cache = None
+                self._dirty.discard(macro_id)
+                self._saved_checksums.pop(macro_id, None)
                 
                 return True
             
@@ -239,8 +318,8 @@ class MacroManager:
     def get_macro(self, macro_id: str) -> Optional[MacroData]:
         """Get macro by ID."""
         try:
-            with self._lock:
-                return self._macros.get(macro_id)
+            # Lock-free: single dict lookup
+            return self._macros.get(macro_id)
         except Exception as e:
             self.logger.error(f"Failed to get macro: {e}")
             return None
@@ -248,11 +327,11 @@ class MacroManager:
     def get_macro_by_slot(self, slot: int) -> Optional[MacroData]:
         """Get macro by slot number."""
         try:
-            with self._lock:
-                macro_id = self._slots.get(slot)
-                if macro_id:
-                    return self._macros.get(macro_id)
-                return None
+            # Lock-free: two atomic dict lookups (writers hold _lock)
+            macro_id = self._slots.get(slot)
+            if macro_id:
+                return self._macros.get(macro_id)
+            return None
         except Exception as e:
             self.logger.error(f"Failed to get macro by slot: {e}")
             return None
@@ -260,11 +339,11 @@ class MacroManager:
     def get_macro_by_hotkey(self, hotkey: str) -> Optional[MacroData]:
         """Get macro by hotkey."""
         try:
-            with self._lock:
-                macro_id = self._hotkeys.get(hotkey)
-                if macro_id:
-                    return self._macros.get(macro_id)
-                return None
+            # Lock-free: two atomic dict lookups (writers hold _lock)
+            macro_id = self._hotkeys.get(hotkey)
+            if macro_id:
+                return self._macros.get(macro_id)
+            return None
         except Exception as e:
             self.logger.error(f"Failed to get macro by hotkey: {e}")
             return None
@@ -272,8 +351,19 @@ class MacroManager:
     def list_macros(self) -> List[Tuple[str, MacroMetadata]]:
         """List all macros."""
         try:
-            with self._lock:
-                return [(id, macro.metadata) for id, macro in self._macros.items()]
+            # Fast path while nothing changed
+            cached = self._list_cache
+            if cached is None:
+                with self._lock:
+                    cached = self._list_cache
+                    if cached is None:
+                        cached = self._list_cache = tuple(
+                            (id, macro.metadata)
+                            for id, macro in self._macros.items()
+                        )
+            
+            # Copy so callers can sort or filter in place
+            return list(cached)
         except Exception as e:
             self.logger.error(f"Failed to list macros: {e}")
             return []
@@ -283,19 +373,19 @@ class MacroManager:
         macro_dir = Path(config_manager.get_value('macro_directory'))
         return macro_dir / f"{macro_id}.atomic"
 
-    def _calculate_checksum(self, macro: MacroData) -> str:
-        """Calculate macro checksum."""
+    def _calculate_checksum(self, *parts: bytes, legacy: bool = False) -> str:
+        """Calculate checksum of a serialized macro payload."""
         try:
-            # Convert to JSON
-            data = {
-                'metadata': asdict(macro.metadata),
-                'events': [asdict(e) for e in macro.events],
-                'script': macro.script
-            }
-            json_data = json.dumps(data, sort_keys=True)
+            if legacy:
+                digest = hashlib.sha256()
+            else:
+                digest = hashlib.blake2b(digest_size=32)
+            for part in parts:
+                digest.update(part)
             
-            # Calculate hash
-            return hashlib.sha256(json_data.encode()).hexdigest()
+            if legacy:
+                return digest.hexdigest()
+            return _BLAKE2B_TAG + digest.hexdigest()
             
         except Exception as e:
             self.logger.error(f"Failed to calculate checksum: {e}")
@@ -304,27 +394,55 @@ class MacroManager:
     def load_macro(self, path: Path) -> Optional[MacroData]:
         """Load macro from file."""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = _loads(raw)
+            checksum = data.get('checksum', '')
+            legacy = not checksum.startswith(_BLAKE2B_TAG)
+            
+            # Hash the stored payload as-is (no copy), then drop the
+            # file contents before building events
+            current_checksum = None
+            if checksum and raw.startswith(_CHECKSUM_PREFIX):
+                end = raw.index(b'",', len(_CHECKSUM_PREFIX))
+                current_checksum = self._calculate_checksum(
+                    b'{', memoryview(raw)[end + 2:], legacy=legacy
+                )
+            del raw
             
             # Create metadata
             metadata = MacroMetadata(**data['metadata'])
             
-            # Create events
-            events = [InputEvent(**e) for e in data['events']]
+            # Create events (JSON stores the type by value)
+            make_event = InputEvent
+            to_type = InputType
+            events = []
+            append = events.append
+            for e in data.pop('events'):
+                e['type'] = to_type(e['type'])
+                if e.get('relative_pos') is not None:
+                    e['relative_pos'] = tuple(e['relative_pos'])
+                append(make_event(**e))
             
             # Create macro
             macro = MacroData(
                 metadata=metadata,
                 events=events,
                 script=data.get('script'),
-                checksum=data.get('checksum', '')
+                checksum=checksum
             )
             
             # Verify checksum
-            if macro.checksum:
-                current_checksum = self._calculate_checksum(macro)
-                if current_checksum != macro.checksum:
+            if checksum:
+                if current_checksum is None:
+                    if legacy:
+                        payload = _legacy_payload(macro)
+                    else:
+                        payload = _macro_payload(macro)
+                    current_checksum = self._calculate_checksum(
+                        payload, legacy=legacy
+                    )
+                if current_checksum != checksum:
                     self.logger.warning(f"Checksum mismatch for {path}")
             
             return macro
@@ -340,69 +458,122 @@ class MacroManager:
                 if macro_id not in self._macros:
                     return False
                 
-                macro = self._macros[macro_id]
-                path = self._get_macro_path(macro_id)
-                
-                # Convert to JSON
-                data = {
-                    'metadata': asdict(macro.metadata),
-                    'events': [asdict(e) for e in macro.events],
-                    'script': macro.script,
-                    'checksum': macro.checksum
-                }
-                
-                # Save file
-                with open(path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2)
-                
+                self._write_macro(macro_id)
                 return True
             
         except Exception as e:
             self.logger.error(f"Failed to save macro: {e}")
             return False
 
+    def _write_macro(self, macro_id: str) -> bool:
+        """Write macro to file (caller holds the lock).
+        
+        Returns False if the file was already up to date.
+        """
+        macro = self._macros[macro_id]
+        
+        # Serialize current state; callers may have mutated the macro
+        payload = _macro_payload(macro)
+        macro.checksum = self._calculate_checksum(payload)
+        self._dirty.discard(macro_id)
+        
+        # Unchanged since last written
+        if self._saved_checksums.get(macro_id) == macro.checksum:
+            return False
+        
+        # Write to a temporary file first
+        path = self._get_macro_path(macro_id)
+        tmp_path = path.with_suffix('.atomic.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_CHECKSUM_PREFIX)
+            f.write(macro.checksum.encode('ascii'))
+            f.write(b'",')
+            f.write(payload[1:])
+        
+        # Atomically move new file into place
+        os.replace(tmp_path, path)
+        
+        self._saved_checksums[macro_id] = macro.checksum
+        return True
+
+    def _save_dirty(self) -> int:
+        """Write changed macros (caller holds the lock).
+        
+        Returns the number of files written.
+        """
+        written = 0
+        for macro_id in list(self._dirty):
+            try:
+                if self._write_macro(macro_id):
+                    written += 1
+            except Exception as e:
+                self.logger.error(f"Failed to save macro {macro_id}: {e}")
+        return written
+
     def _auto_save(self):
         """Auto-save macros."""
         try:
-            current_time = time.time()
+            current_time = time.monotonic()
             if current_time - self._last_save >= self._save_interval:
-                # Save all macros
-                for macro_id in self._macros:
-                    self.save_macro(macro_id)
+                # Save changed macros
+                written = self._save_dirty()
                 
                 self._last_save = current_time
                 
-                # Create backup
-                self._create_backup()
+                # Create backup (only if something changed)
+                if written:
+                    self._create_backup()
             
         except Exception as e:
             self.logger.error(f"Failed to auto-save: {e}")
 
-    def _create_backup(self):
-        """Create backup of macro directory."""
+    def _create_backup(self) -> Optional[threading.Thread]:
+        """Start a background backup of the macro directory."""
         try:
+            # Previous backup still running
+            if self._backup_thread and self._backup_thread.is_alive():
+                return self._backup_thread
+            
             # Get directories
             macro_dir = Path(config_manager.get_value('macro_directory'))
             backup_dir = Path(config_manager.get_value('backup_directory'))
             if not backup_dir:
                 backup_dir = macro_dir / "backups"
+            
+            self._backup_thread = threading.Thread(
+                target=self._write_backup,
+                args=(macro_dir, backup_dir),
+                daemon=True
+            )
+            self._backup_thread.start()
+            return self._backup_thread
+            
+        except Exception as e:
+            self.logger.error(f"Failed to start backup: {e}")
+            return None
+
+    def _write_backup(self, macro_dir: Path, backup_dir: Path):
+        """Archive macro files and prune old backups."""
+        try:
             backup_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create backup
+            # Create backup (macro files only)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_path = backup_dir / f"macros_{timestamp}.zip"
             
-            shutil.make_archive(
-                str(backup_path.with_suffix('')),
-                'zip',
-                macro_dir
-            )
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=1) as archive:
+                for file in macro_dir.glob('*.atomic'):
+                    archive.write(file, file.name)
             
             # Remove old backups
             backups = sorted(backup_dir.glob('*.zip'))
-            while len(backups) > self._max_backups:
-                backups[0].unlink()
-                backups = backups[1:]
+            excess = len(backups) - self._max_backups
+            for old in backups[:max(0, excess)]:
+                try:
+                    old.unlink()
+                except OSError as e:
+                    self.logger.warning(f"Failed to remove backup {old}: {e}")
             
         except Exception as e:
             self.logger.error(f"Failed to create backup: {e}")
@@ -410,13 +581,15 @@ class MacroManager:
     def cleanup(self):
         """Clean up resources."""
         try:
-            # Save all macros
+            # Save changed macros
             with self._lock:
-                for macro_id in self._macros:
-                    self.save_macro(macro_id)
+                written = self._save_dirty()
             
             # Create final backup
-            self._create_backup()
+            if written:
+                backup_thread = self._create_backup()
+                if backup_thread:
+                    backup_thread.join()
             
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
@@ -4,10 +4,13 @@ Copyright (c) 2025 AtomicArk
 """
 
 import logging
+import builtins
+import ctypes
 import threading
-from typing import Dict, List, Optional, Any, Callable
+from functools import lru_cache
+from types import CodeType
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
 import time
-import ast
 import inspect
 from pathlib import Path
 import traceback
@@ -17,77 +20,112 @@ from .window_manager import window_manager
 from .input_simulator import input_simulator, MouseButton
 from .recorder import RecordingMode
 
+@lru_cache(maxsize=128)
+def _compile_script(script: str) -> Tuple[Optional[str], Optional[CodeType]]:
+    """Compile script source, returning (error, code)."""
+    try:
+        return None, compile(script, '<macro>', 'exec', dont_inherit=True)
+    except SyntaxError as e:
+        return f"Line {e.lineno}: {e.msg}", None
+    except Exception as e:
+        return str(e), None
+
 class ScriptAPI:
     """API for macro scripts."""
     
+    # Methods exposed to scripts
+    _API_NAMES = (
+        # Input functions
+        'key_press', 'key_down', 'key_up',
+        'mouse_move', 'mouse_click', 'mouse_scroll',
+        
+        # Window functions
+        'get_window', 'find_window', 'get_active_window', 'bring_to_front',
+        
+        # Utility functions
+        'sleep', 'log', 'debug', 'wait_for_window', 'repeat', 'wait_until'
+    )
+    
+    # Constants exposed to scripts
+    _API_CONSTANTS = {
+        'MOUSE_LEFT': MouseButton.LEFT.name,
+        'MOUSE_RIGHT': MouseButton.RIGHT.name,
+        'MOUSE_MIDDLE': MouseButton.MIDDLE.name
+    }
+    
+    __slots__ = (
+        'logger', '_locals', '_globals', '_stop_flag', '_stopped',
+        '_key_press_impl', '_key_down_impl', '_key_up_impl',
+        '_mouse_move_impl', '_mouse_click_impl', '_mouse_scroll_impl'
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger('ScriptAPI')
         self._locals: Dict[str, Any] = {}
         self._globals: Dict[str, Any] = {}
-        self._stop_flag = False
+        self._stop_flag = threading.Event()
+        self._stopped = False  # Mirrors _stop_flag for cheap checks
+        
+        # Input simulator methods (bound once for the hot path)
+        self._key_press_impl = input_simulator.key_press
+        self._key_down_impl = input_simulator.key_down
+        self._key_up_impl = input_simulator.key_up
+        self._mouse_move_impl = input_simulator.mouse_move
+        self._mouse_click_impl = input_simulator.mouse_click
+        self._mouse_scroll_impl = input_simulator.mouse_scroll
         
         # Initialize API
         self._init_api()
 
     def _init_api(self):
         """Initialize API functions."""
-        # Input functions
-        self._globals['key_press'] = self.key_press
-        self._globals['key_down'] = self.key_down
-        self._globals['key_up'] = self.key_up
-        self._globals['mouse_move'] = self.mouse_move
-        self._globals['mouse_click'] = self.mouse_click
-        self._globals['mouse_scroll'] = self.mouse_scroll
-        
-        # Window functions
-        self._globals['get_window'] = self.get_window
-        self._globals['find_window'] = self.find_window
-        self._globals['get_active_window'] = self.get_active_window
-        self._globals['bring_to_front'] = self.bring_to_front
-        
-        # Utility functions
-        self._globals['sleep'] = self.sleep
-        self._globals['log'] = self.log
-        self._globals['debug'] = self.debug
-        self._globals['wait_for_window'] = self.wait_for_window
-        self._globals['repeat'] = self.repeat
-        self._globals['wait_until'] = self.wait_until
+        # Functions
+        for name in self._API_NAMES:
+            self._globals[name] = getattr(self, name)
         
         # Constants
-        self._globals['MOUSE_LEFT'] = MouseButton.LEFT.name
-        self._globals['MOUSE_RIGHT'] = MouseButton.RIGHT.name
-        self._globals['MOUSE_MIDDLE'] = MouseButton.MIDDLE.name
+        self._globals.update(self._API_CONSTANTS)
+        
+        # Builtins (exec-ready; `__builtins__` is a module or a dict
+        # depending on how this module was imported)
+        self._globals['__builtins__'] = builtins.__dict__
 
     def key_press(self, key: str, duration: Optional[float] = None) -> bool:
         """Press and release a key."""
-        self._check_stop()
-        return input_simulator.key_press(key, duration)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._key_press_impl(key, duration)
 
     def key_down(self, key: str) -> bool:
         """Press a key."""
-        self._check_stop()
-        return input_simulator.key_down(key)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._key_down_impl(key)
 
     def key_up(self, key: str) -> bool:
         """Release a key."""
-        self._check_stop()
-        return input_simulator.key_up(key)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._key_up_impl(key)
 
     def mouse_move(self, x: int, y: int, duration: Optional[float] = None,
                   relative: bool = False) -> bool:
         """Move mouse cursor."""
-        self._check_stop()
-        return input_simulator.mouse_move(x, y, duration, relative)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._mouse_move_impl(x, y, duration, relative)
 
     def mouse_click(self, button: str, duration: Optional[float] = None) -> bool:
         """Click mouse button."""
-        self._check_stop()
-        return input_simulator.mouse_click(button, duration)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._mouse_click_impl(button, duration)
 
     def mouse_scroll(self, delta: int) -> bool:
         """Scroll mouse wheel."""
-        self._check_stop()
-        return input_simulator.mouse_scroll(delta)
+        if self._stopped:
+            raise InterruptedError("Script execution stopped")
+        return self._mouse_scroll_impl(delta)
 
     def get_window(self, handle: int) -> Optional[Dict]:
         """Get window information."""
@@ -144,7 +182,7 @@ class ScriptAPI:
     def sleep(self, seconds: float) -> None:
         """Sleep for specified duration."""
         self._check_stop()
-        time.sleep(seconds)
+        self._sleep(seconds)
 
     def log(self, message: str) -> None:
         """Log message."""
@@ -157,46 +195,71 @@ class ScriptAPI:
     def wait_for_window(self, title: str, timeout: float = 10.0) -> Optional[Dict]:
         """Wait for window to appear."""
         self._check_stop()
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        while True:
             window = self.find_window(title=title)
             if window:
                 return window
-            time.sleep(0.1)
-            self._check_stop()
-        return None
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._sleep(min(0.1, remaining))
 
     def repeat(self, count: int, func: Callable, *args, **kwargs) -> None:
         """Repeat function multiple times."""
         self._check_stop()
-        for _ in range(count):
+        stop_flag = self._stop_flag
+        for i in range(count):
             func(*args, **kwargs)
-            self._check_stop()
+            
+            # Check every 256 iterations
+            if not i & 0xFF and stop_flag.is_set():
+                raise InterruptedError("Script execution stopped")
 
-    def wait_until(self, condition: Callable[[], bool],
+    def wait_until(self, condition: Union[Callable[[], bool], threading.Event],
                   timeout: float = 10.0) -> bool:
-        """Wait until condition is met."""
+        """Wait until condition is met (a callable or a threading.Event)."""
         self._check_stop()
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        deadline = time.monotonic() + timeout
+        if isinstance(condition, threading.Event):
+            # Wakes as soon as the event is set
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return condition.is_set()
+                if condition.wait(min(0.1, remaining)):
+                    return True
+                self._check_stop()
+        
+        while True:
             if condition():
                 return True
-            time.sleep(0.1)
-            self._check_stop()
-        return False
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._sleep(min(0.1, remaining))
+
+    def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early (and raising) if the script is stopped."""
+        if self._stop_flag.wait(seconds):
+            raise InterruptedError("Script execution stopped")
 
     def _check_stop(self) -> None:
         """Check if script should stop."""
-        if self._stop_flag:
+        if self._stopped:
             raise InterruptedError("Script execution stopped")
 
     def stop(self) -> None:
         """Stop script execution."""
-        self._stop_flag = True
+        self._stopped = True
+        self._stop_flag.set()
 
     def reset(self) -> None:
         """Reset script state."""
-        self._stop_flag = False
+        self._stopped = False
+        self._stop_flag.clear()
         self._locals.clear()
 
 class MacroScript:
@@ -223,17 +286,14 @@ class MacroScript:
             self._script_thread: Optional[threading.Thread] = None
             self._running = False
             
+            # API documentation (built on first request)
+            self._api_docs: Optional[Dict[str, str]] = None
+            
             self._initialized = True
 
     def validate_script(self, script: str) -> Optional[str]:
         """Validate script syntax."""
-        try:
-            ast.parse(script)
-            return None
-        except SyntaxError as e:
-            return f"Line {e.lineno}: {e.msg}"
-        except Exception as e:
-            return str(e)
+        return _compile_script(script)[0]
 
     def run_script(self, script: str) -> bool:
         """Run script."""
@@ -242,8 +302,8 @@ class MacroScript:
             if self._running:
                 return False
             
-            # Validate script
-            error = self.validate_script(script)
+            # Validate script (compiled once, shared with validate_script)
+            error, code = _compile_script(script)
             if error:
                 self.logger.error(f"Script validation failed: {error}")
                 return False
@@ -251,18 +311,20 @@ class MacroScript:
             # Reset API
             self._api.reset()
             
-            # Start script thread
+            # Start script thread (mark running first; a short script may
+            # finish and clear the flag before start() returns)
             self._script_thread = threading.Thread(
                 target=self._run_script_thread,
-                args=(script,),
+                args=(code,),
                 name="MacroScript"
             )
-            self._script_thread.start()
             self._running = True
+            self._script_thread.start()
             
             return True
             
         except Exception as e:
+            self._running = False
             self.logger.error(f"Failed to run script: {e}")
             return False
 
@@ -278,6 +340,11 @@ class MacroScript:
             # Wait for thread
             if self._script_thread and self._script_thread.is_alive():
                 self._script_thread.join(timeout=1.0)
+                
+                # Script never reached a stop check (e.g. a tight loop)
+                if self._script_thread.is_alive():
+                    self._interrupt_thread(self._script_thread)
+                    self._script_thread.join(timeout=1.0)
             
             # Reset state
             self._running = False
@@ -289,15 +356,29 @@ class MacroScript:
             self.logger.error(f"Failed to stop script: {e}")
             return False
 
-    def _run_script_thread(self, script: str) -> None:
+    def _interrupt_thread(self, thread: threading.Thread) -> None:
+        """Raise InterruptedError inside a running script thread."""
+        try:
+            thread_id = ctypes.c_ulong(thread.ident)
+            count = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                thread_id, ctypes.py_object(InterruptedError)
+            )
+            if count > 1:
+                # More than one thread hit; revert
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to interrupt script thread: {e}")
+
+    def _run_script_thread(self, code: CodeType) -> None:
         """Script execution thread."""
         try:
-            # Prepare globals
+            # Fresh globals per run, so `global` statements cannot leak
+            # into (or clobber the API for) later runs
             globals_dict = self._api._globals.copy()
-            globals_dict['__builtins__'] = __builtins__
             
             # Execute script
-            exec(script, globals_dict, self._api._locals)
+            exec(code, globals_dict, self._api._locals)
             
         except InterruptedError:
             self.logger.info("Script execution stopped")
@@ -312,13 +393,15 @@ class MacroScript:
 
     def get_api_docs(self) -> Dict[str, str]:
         """Get API documentation."""
-        docs = {}
-        for name, func in self._api._globals.items():
-            if callable(func) and not name.startswith('_'):
-                doc = inspect.getdoc(func)
+        # Docstrings never change, so collect them once
+        if self._api_docs is None:
+            docs = {}
+            for name in self._api._API_NAMES:
+                doc = inspect.getdoc(getattr(ScriptAPI, name))
                 if doc:
                     docs[name] = doc
-        return docs
+            self._api_docs = docs
+        return dict(self._api_docs)
 
     def cleanup(self):
         """Clean up resources."""
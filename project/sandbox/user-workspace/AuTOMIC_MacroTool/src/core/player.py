@@ -5,7 +5,8 @@ Copyright (c) 2025 AtomicArk
 
 import logging
 import threading
-from typing import List, Optional, Callable
+from dataclasses import replace
+from typing import Dict, List, Optional, Callable
 from enum import Enum, auto
 import time
 import random
@@ -15,7 +16,7 @@ import win32gui
 
 from ..utils.debug_helper import get_debug_helper
 from .window_manager import window_manager
-from .input_simulator import input_simulator, InputType, InputEvent, MouseButton
+from .input_simulator import input_simulator, InputType, InputEvent
 from .recorder import RecordingMode
 
 class PlaybackMode(Enum):
@@ -211,9 +212,11 @@ class MacroPlayer:
                 # Wait for correct timing
                 self._wait_for_timing(event.timestamp)
                 
-                # Process event
+                # Process event, batched with any that are already due
                 if self._state == PlaybackState.PLAYING:
-                    self._process_event(event)
+                    end = self._due_events_end()
+                    self._process_events(self._events[self._current_index:end])
+                    self._current_index = end - 1
                 
                 # Update progress
                 self._notify_progress()
@@ -273,49 +276,61 @@ class MacroPlayer:
             
             time.sleep(wait_time)
 
-    def _process_event(self, event: InputEvent) -> None:
-        """Process input event."""
+    def _due_events_end(self) -> int:
+        """Get the index after the current event and all events already due."""
+        events = self._events
+        elapsed = (time.time() - self._start_time) * self._speed_multiplier
+        end = self._current_index + 1
+        while end < len(events) and events[end].timestamp <= elapsed:
+            end += 1
+        return end
+
+    def _process_events(self, events: List[InputEvent]) -> None:
+        """Process input events, sending runs without focus changes together."""
         try:
-            # Handle window-relative events
-            if event.window_handle and event.window_title:
-                # Find window
-                window = window_manager.find_window(title=event.window_title)
-                if not window:
-                    self.logger.warning(f"Target window not found: {event.window_title}")
-                    return
-                
-                # Bring to front
-                window_manager.bring_to_front(window.handle)
+            batch: List[InputEvent] = []
+            windows: Dict[str, Optional[int]] = {}
+            focused = None
             
-            # Process by type
-            if event.type == InputType.KEYBOARD:
-                if event.data['action'] == 'press':
-                    input_simulator.key_down(event.data['key'])
-                else:
-                    input_simulator.key_up(event.data['key'])
-                
-            elif event.type == InputType.MOUSE_MOVE:
-                x = event.data['x']
-                y = event.data['y']
+            for event in events:
+                # Handle window-relative events
+                if event.window_handle and event.window_title:
+                    # Find window
+                    title = event.window_title
+                    if title not in windows:
+                        window = window_manager.find_window(title=title)
+                        windows[title] = window.handle if window else None
+                    handle = windows[title]
+                    if not handle:
+                        self.logger.warning(f"Target window not found: {title}")
+                        continue
+                    
+                    # Bring to front after the events queued before it
+                    if handle != focused:
+                        if batch:
+                            input_simulator.simulate_events(batch)
+                            batch = []
+                        window_manager.bring_to_front(handle)
+                        focused = handle
                 
                 # Handle relative coordinates
-                if 'relative_x' in event.data and event.window_handle:
+                data = event.data
+                if (event.type == InputType.MOUSE_MOVE and
+                        'relative_x' in data and event.window_handle):
                     window_rect = win32gui.GetWindowRect(event.window_handle)
-                    x = window_rect[0] + event.data['relative_x']
-                    y = window_rect[1] + event.data['relative_y']
+                    event = replace(event, data={
+                        **data,
+                        'x': window_rect[0] + data['relative_x'],
+                        'y': window_rect[1] + data['relative_y']
+                    })
                 
-                input_simulator.mouse_move(x, y)
-                
-            elif event.type == InputType.MOUSE_CLICK:
-                button = MouseButton[event.data['button']]
-                if event.data['action'] == 'press':
-                    input_simulator.mouse_click(button)
-                
-            elif event.type == InputType.MOUSE_SCROLL:
-                input_simulator.mouse_scroll(event.data['dy'])
+                batch.append(event)
+            
+            if batch:
+                input_simulator.simulate_events(batch)
             
         except Exception as e:
-            self.logger.error(f"Failed to process event: {e}")
+            self.logger.error(f"Failed to process events: {e}")
 
     def _start_input_monitoring(self) -> None:
         """Start input monitoring."""
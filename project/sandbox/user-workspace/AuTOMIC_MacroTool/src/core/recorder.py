@@ -5,7 +5,7 @@ Copyright (c) 2025 AtomicArk
 
 import logging
 import threading
-from typing import Dict, List, Optional, Set, Callable
+from typing import Dict, List, Optional, Callable, Set
 from enum import Enum, auto
 import time
 from datetime import datetime
@@ -19,6 +19,15 @@ from ..utils.debug_helper import get_debug_helper
 from .window_manager import window_manager
 from .input_simulator import InputType, InputEvent, MouseButton
 
+def _key_bit(key) -> int:
+    """Get pressed-key bitmask bit for a pynput key (0 if it has no VK)."""
+    vk = getattr(key, 'vk', None)
+    if vk is None:
+        vk = getattr(getattr(key, 'value', None), 'vk', None)
+    if vk is None or not 0 <= vk < 256:
+        return 0
+    return 1 << vk
+
 class RecordingMode(Enum):
     """Recording modes."""
     WINDOW = auto()  # Record relative to window
@@ -60,11 +69,21 @@ class MacroRecorder:
             self._record_delays = True
             self._min_delay = 0.01  # Minimum delay in seconds
             
-            # Input tracking
-            self._pressed_keys: Set[str] = set()
-            self._pressed_buttons: Set[MouseButton] = set()
+            # Input tracking as bitmasks (bit = VK code / button value),
+            # written only by the listener threads, so readers never lock
+            self._pressed_keys: int = 0
+            self._pressed_buttons: int = 0
+            # Keys without a VK code, by str(key)
+            self._pressed_other: Set[str] = set()
             self._last_pos: Optional[tuple[int, int]] = None
             
+            # pynput button -> MouseButton
+            self._button_map = {
+                pynput_mouse.Button.left: MouseButton.LEFT,
+                pynput_mouse.Button.right: MouseButton.RIGHT,
+                pynput_mouse.Button.middle: MouseButton.MIDDLE
+            }
+            
             # Callbacks
             self._state_callbacks: List[Callable[[RecordingState], None]] = []
             
@@ -92,8 +111,9 @@ class MacroRecorder:
                 
                 # Reset state
                 self._events.clear()
-                self._pressed_keys.clear()
-                self._pressed_buttons.clear()
+                self._pressed_keys = 0
+                self._pressed_buttons = 0
+                self._pressed_other.clear()
                 self._last_pos = None
                 
                 # Set mode and target
@@ -134,8 +154,9 @@ class MacroRecorder:
                     self._mouse_listener.stop()
                 
                 # Release tracking
-                self._pressed_keys.clear()
-                self._pressed_buttons.clear()
+                self._pressed_keys = 0
+                self._pressed_buttons = 0
+                self._pressed_other.clear()
                 
                 # Update state
                 self._state = RecordingState.STOPPED
@@ -201,18 +222,21 @@ class MacroRecorder:
 
     def _on_key_press(self, key) -> None:
         """Handle key press event."""
+        if self._state != RecordingState.RECORDING:
+            return
+        
         try:
-            if self._state != RecordingState.RECORDING:
-                return
-            
             # Convert key to string
-            try:
-                key_str = key.char
-            except AttributeError:
+            key_str = getattr(key, 'char', None)
+            if key_str is None:
                 key_str = str(key).replace('Key.', '')
             
-            # Skip if already pressed
-            if key_str in self._pressed_keys:
+            # Skip if already pressed (auto-repeat)
+            bit = _key_bit(key)
+            if bit:
+                if self._pressed_keys & bit:
+                    return
+            elif str(key) in self._pressed_other:
                 return
             
             # Add event
@@ -222,25 +246,31 @@ class MacroRecorder:
             })
             
             # Update tracking
-            self._pressed_keys.add(key_str)
+            if bit:
+                self._pressed_keys |= bit
+            else:
+                self._pressed_other.add(str(key))
             
         except Exception as e:
             self.logger.error(f"Failed to handle key press: {e}")
 
     def _on_key_release(self, key) -> None:
         """Handle key release event."""
+        if self._state != RecordingState.RECORDING:
+            return
+        
         try:
-            if self._state != RecordingState.RECORDING:
-                return
-            
             # Convert key to string
-            try:
-                key_str = key.char
-            except AttributeError:
+            key_str = getattr(key, 'char', None)
+            if key_str is None:
                 key_str = str(key).replace('Key.', '')
             
             # Skip if not pressed
-            if key_str not in self._pressed_keys:
+            bit = _key_bit(key)
+            if bit:
+                if not self._pressed_keys & bit:
+                    return
+            elif str(key) not in self._pressed_other:
                 return
             
             # Add event
@@ -250,21 +280,24 @@ class MacroRecorder:
             })
             
             # Update tracking
-            self._pressed_keys.remove(key_str)
+            if bit:
+                self._pressed_keys &= ~bit
+            else:
+                self._pressed_other.discard(str(key))
             
         except Exception as e:
             self.logger.error(f"Failed to handle key release: {e}")
 
     def _on_mouse_move(self, x: int, y: int) -> None:
         """Handle mouse move event."""
+        if self._state != RecordingState.RECORDING:
+            return
+        
+        # Skip if position unchanged
+        if self._last_pos == (x, y):
+            return
+        
         try:
-            if self._state != RecordingState.RECORDING:
-                return
-            
-            # Skip if position unchanged
-            if self._last_pos == (x, y):
-                return
-            
             # Convert coordinates
             if self._mode == RecordingMode.WINDOW and self._target_window:
                 # Get window position
@@ -296,24 +329,18 @@ class MacroRecorder:
 
     def _on_mouse_click(self, x: int, y: int, button, pressed: bool) -> None:
         """Handle mouse click event."""
+        if self._state != RecordingState.RECORDING:
+            return
+        
         try:
-            if self._state != RecordingState.RECORDING:
-                return
-            
             # Convert button
-            button_map = {
-                pynput_mouse.Button.left: MouseButton.LEFT,
-                pynput_mouse.Button.right: MouseButton.RIGHT,
-                pynput_mouse.Button.middle: MouseButton.MIDDLE
-            }
-            mouse_button = button_map.get(button)
+            mouse_button = self._button_map.get(button)
             if not mouse_button:
                 return
             
             # Skip if state unchanged
-            if pressed and mouse_button in self._pressed_buttons:
-                return
-            if not pressed and mouse_button not in self._pressed_buttons:
+            bit = 1 << mouse_button.value
+            if bool(self._pressed_buttons & bit) == pressed:
                 return
             
             # Add event
@@ -326,19 +353,19 @@ class MacroRecorder:
             
             # Update tracking
             if pressed:
-                self._pressed_buttons.add(mouse_button)
+                self._pressed_buttons |= bit
             else:
-                self._pressed_buttons.remove(mouse_button)
+                self._pressed_buttons &= ~bit
             
         except Exception as e:
             self.logger.error(f"Failed to handle mouse click: {e}")
 
     def _on_mouse_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
         """Handle mouse scroll event."""
+        if self._state != RecordingState.RECORDING:
+            return
+        
         try:
-            if self._state != RecordingState.RECORDING:
-                return
-            
             # Add event
             self._add_event(InputType.MOUSE_SCROLL, {
                 'x': x,
@@ -383,10 +410,9 @@ class MacroRecorder:
                 window_title=window_title
             )
             
-            # Add event
-            with self._lock:
-                self._events.append(event)
-                self._last_time = current_time
+            # Add event (list.append is atomic, no lock on the hot path)
+            self._events.append(event)
+            self._last_time = current_time
             
         except Exception as e:
             self.logger.error(f"Failed to add event: {e}")
@@ -0,0 +1,10 @@
+"""
+Python version compatibility helpers.
+Copyright (c) 2025 AtomicArk
+"""
+
+import sys
+
+# Keyword arguments enabling __slots__ on dataclasses where supported
+# (``dataclass(slots=True)`` requires Python 3.10)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
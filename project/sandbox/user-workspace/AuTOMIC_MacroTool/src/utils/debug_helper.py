@@ -9,6 +9,7 @@ import time
 import threading
 import traceback
 from enum import Enum, auto
+from functools import lru_cache
 from typing import Optional, Dict, List
 from pathlib import Path
 from datetime import datetime
@@ -18,6 +19,25 @@ import win32con
 import win32gui
 import win32process
 
+# Log directory
+LOG_DIR = Path.home() / "Documents" / "AuTOMIC_MacroTool" / "logs"
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> Path:
+    """Create directory once per process and return it."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+class _LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and file on first write."""
+    
+    def __init__(self, filename, encoding=None):
+        super().__init__(filename, encoding=encoding, delay=True)
+    
+    def _open(self):
+        _ensure_dir(Path(self.baseFilename).parent)
+        return super()._open()
+
 class DebugLevel(Enum):
     """Debug logging levels."""
     NONE = auto()
@@ -61,14 +81,10 @@ class DebugHelper:
     def _init_logging(self):
         """Initialize logging system."""
         try:
-            # Get log directory
-            log_dir = Path.home() / "Documents" / "AuTOMIC_MacroTool" / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create log file
+            # Log files (created on first write)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            self._log_file = log_dir / f"debug_{timestamp}.log"
-            self._crash_file = log_dir / f"crash_{timestamp}.log"
+            self._log_file = LOG_DIR / f"debug_{timestamp}.log"
+            self._crash_file = LOG_DIR / f"crash_{timestamp}.log"
             
             # Configure logging
             formatter = logging.Formatter(
@@ -76,7 +92,7 @@ class DebugHelper:
             )
             
             # File handler
-            file_handler = logging.FileHandler(
+            file_handler = _LazyFileHandler(
                 self._log_file,
                 encoding='utf-8'
             )
@@ -109,6 +125,7 @@ class DebugHelper:
             
             # Save crash report
             if self._crash_file:
+                _ensure_dir(self._crash_file.parent)
                 with open(self._crash_file, 'w', encoding='utf-8') as f:
                     # Exception info
                     f.write("=== Exception Details ===\n")
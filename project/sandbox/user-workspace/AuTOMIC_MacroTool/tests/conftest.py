@@ -0,0 +1,13 @@
+"""
+Shared test setup.
+Copyright (c) 2025 AtomicArk
+"""
+
+import os
+import tempfile
+
+# Singletons created on import resolve their storage from the home
+# directory; point it somewhere disposable before any src import
+_home = tempfile.mkdtemp(prefix='atomic-test-home-')
+os.environ['HOME'] = _home
+os.environ['USERPROFILE'] = _home
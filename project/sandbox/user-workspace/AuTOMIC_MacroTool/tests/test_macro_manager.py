@@ -0,0 +1,85 @@
+"""
+Tests for macro storage.
+Copyright (c) 2025 AtomicArk
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict
+
+import pytest
+
+from src.core.config_manager import config_manager
+from src.core.macro_manager import MacroManager, MacroMetadata
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Fresh MacroManager storing macros and backups under tmp_path."""
+    dirs = {
+        'macro_directory': str(tmp_path),
+        'backup_directory': str(tmp_path / 'backups')
+    }
+    get_value = config_manager.get_value
+    monkeypatch.setattr(config_manager, 'get_value',
+                        lambda key, default=None: dirs.get(key) or
+                        get_value(key, default))
+    monkeypatch.setattr(MacroManager, '_instance', None)
+    return MacroManager()
+
+def _write_baseline_macro(path, metadata, events, script):
+    """Write a macro file the way the original save_macro did."""
+    data = {
+        'metadata': asdict(metadata),
+        'events': events,
+        'script': script
+    }
+    checksum = hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode()
+    ).hexdigest()
+    
+    data['checksum'] = checksum
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return checksum
+
+def test_load_baseline_macro_checksum(manager, tmp_path, caplog):
+    """SHA-256 checksums from original files verify without warnings."""
+    path = tmp_path / "0123abcd.atomic"
+    metadata = MacroMetadata(name="Zażółć", description="legacy",
+                             tags=['b', 'a'], hotkey='F5', slot=2)
+    checksum = _write_baseline_macro(path, metadata, [], "log('hi')\n")
+    
+    with caplog.at_level(logging.WARNING, logger='MacroManager'):
+        macro = manager.load_macro(path)
+    
+    assert macro is not None
+    assert macro.checksum == checksum
+    assert macro.script == "log('hi')\n"
+    assert macro.metadata == metadata
+    assert "Checksum mismatch" not in caplog.text
+
+def test_load_tampered_baseline_macro_warns(manager, tmp_path, caplog):
+    """Edited original files are still reported."""
+    path = tmp_path / "0123abcd.atomic"
+    _write_baseline_macro(path, MacroMetadata(name="legacy"), [], "x = 1")
+    path.write_text(path.read_text(encoding='utf-8').replace('x = 1', 'x = 2'),
+                    encoding='utf-8')
+    
+    with caplog.at_level(logging.WARNING, logger='MacroManager'):
+        manager.load_macro(path)
+    
+    assert "Checksum mismatch" in caplog.text
+
+def test_save_after_mutation(manager, tmp_path, caplog):
+    """Saving picks up changes made to a macro handed out by get_macro."""
+    macro_id = manager.create_macro("mutated", [], script="x = 1")
+    manager.get_macro(macro_id).script = "x = 2"
+    assert manager.save_macro(macro_id)
+    
+    with caplog.at_level(logging.WARNING, logger='MacroManager'):
+        macro = manager.load_macro(tmp_path / f"{macro_id}.atomic")
+    
+    assert macro.script == "x = 2"
+    assert macro.checksum == manager.get_macro(macro_id).checksum
+    assert "Checksum mismatch" not in caplog.text